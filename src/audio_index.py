@@ -0,0 +1,191 @@
+import os
+import re
+import json
+
+
+LABEL_FOLDERS = ['0', '1']
+INDEX_VERSION = 2
+
+_DIGIT_RUN = re.compile(r'\d+')
+
+
+def _index_keys(entry_name, parent_name):
+    """IDs a .wav file can be looked up by: its parent folder name and every digit run in its name."""
+    keys = set(_DIGIT_RUN.findall(entry_name))
+    if parent_name:
+        keys.add(parent_name)
+    return keys
+
+
+def scan_audio_files(search_dir, extensions=('.wav',), dir_mtimes=None):
+    """Yield (parent_folder_name, file_name, path) for every file with one of the extensions under search_dir.
+
+    If dir_mtimes is a dict, the mtime of every directory visited is stored
+    in it by path.
+    """
+    stack = [search_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            if dir_mtimes is not None:
+                dir_mtimes[current] = os.stat(current).st_mtime_ns
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(extensions):
+                        parent_name = None if current == search_dir else os.path.basename(current)
+                        yield parent_name, entry.name, entry.path
+        except OSError:
+            continue
+
+
+def _folder_mtimes(base_dir, directories):
+    """{path relative to base_dir: mtime} of each existing directory."""
+    mtimes = {}
+    for directory in directories:
+        try:
+            mtimes[os.path.relpath(directory, base_dir)] = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+    return mtimes
+
+
+class AudioIndex:
+    """ID -> [(label_folder, path), ...] index over the '0' and '1' audio trees."""
+
+    def __init__(self, base_dir, entries=None, folder_mtimes=None):
+        self.base_dir = base_dir
+        self.entries = entries if entries is not None else {}
+        self.folder_mtimes = folder_mtimes if folder_mtimes is not None else {}
+
+    @classmethod
+    def build(cls, base_dir, label_folders=LABEL_FOLDERS):
+        """Walk every label folder once with os.scandir and index all .wav files.
+
+        The mtime of every directory the walk visits is recorded for is_stale().
+        """
+        entries = {}
+        dir_mtimes = {}
+        for label_folder in label_folders:
+            search_dir = os.path.join(base_dir, label_folder)
+            for parent_name, file_name, path in scan_audio_files(search_dir, dir_mtimes=dir_mtimes):
+                for key in _index_keys(file_name, parent_name):
+                    entries.setdefault(key, []).append([label_folder, path])
+        for matches in entries.values():
+            matches.sort()
+        folder_mtimes = {os.path.relpath(directory, base_dir): mtime
+                         for directory, mtime in dir_mtimes.items()}
+        return cls(base_dir, entries, folder_mtimes)
+
+    @classmethod
+    def from_paths(cls, base_dir, paths, label_folders=LABEL_FOLDERS):
+        """Index known .wav paths under base_dir's label folders without walking the tree.
+
+        Only the label folders and the directories holding the paths (and
+        their parents) are recorded for is_stale().
+        """
+        entries = {}
+        directories = {os.path.join(base_dir, label_folder) for label_folder in label_folders}
+        for path in paths:
+            parts = os.path.relpath(path, base_dir).split(os.sep)
+            if len(parts) < 2 or parts[0] not in label_folders:
+                continue
+            parent_name = parts[-2] if len(parts) > 2 else None
+            for key in _index_keys(parts[-1], parent_name):
+                entries.setdefault(key, []).append([parts[0], path])
+            directory = os.path.dirname(path)
+            for _ in range(len(parts) - 1):
+                directories.add(directory)
+                directory = os.path.dirname(directory)
+        for matches in entries.values():
+            matches.sort()
+        return cls(base_dir, entries, _folder_mtimes(base_dir, directories))
+
+    @classmethod
+    def load(cls, index_path):
+        """Load an index previously written with save()."""
+        with open(index_path) as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(
+                f"Unsupported audio index version: {data.get('version')}")
+        return cls(data['base_dir'], data['entries'], data.get('folder_mtimes'))
+
+    @classmethod
+    def load_or_build(cls, base_dir, index_path, rebuild=False):
+        """Reuse a saved index for base_dir, rebuilding it if missing, stale or when rebuild is set."""
+        if not rebuild and os.path.exists(index_path):
+            try:
+                index = cls.load(index_path)
+                if index.base_dir == base_dir and not index.is_stale():
+                    return index
+            except (ValueError, KeyError, json.JSONDecodeError):
+                pass
+        index = cls.build(base_dir)
+        index.save(index_path)
+        return index
+
+    def save(self, index_path, **extra):
+        """Persist the index as JSON so later runs can skip the directory walk.
+
+        extra fields are stored alongside and ignored by load().
+        """
+        index_dir = os.path.dirname(index_path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'base_dir': self.base_dir,
+                       'folder_mtimes': self.folder_mtimes,
+                       'entries': self.entries, **extra}, f)
+        os.replace(tmp_path, index_path)
+
+    def is_stale(self):
+        """True if a directory the index was built from changed or vanished, or a label folder appeared.
+
+        Adding, removing or renaming a file changes its directory's mtime,
+        at any depth, so every recorded directory is checked (one stat each).
+        """
+        for relative_dir, mtime in self.folder_mtimes.items():
+            try:
+                if os.stat(os.path.join(self.base_dir, relative_dir)).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return any(label_folder not in self.folder_mtimes and
+                   os.path.isdir(os.path.join(self.base_dir, label_folder))
+                   for label_folder in LABEL_FOLDERS)
+
+    def __contains__(self, audio_id):
+        return str(audio_id) in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def matches(self, audio_id):
+        """All (label_folder, path) pairs for an audio ID."""
+        return [tuple(match) for match in self.entries.get(str(audio_id), [])]
+
+    def paths(self, audio_id):
+        """All .wav paths for an audio ID."""
+        return [path for _, path in self.entries.get(str(audio_id), [])]
+
+    def label_folder(self, audio_id):
+        """Label folder ('0' or '1') of the first match for an audio ID, or None."""
+        matches = self.entries.get(str(audio_id))
+        return matches[0][0] if matches else None
+
+    def first_path(self, audio_id):
+        """First .wav path for an audio ID, or None."""
+        matches = self.entries.get(str(audio_id))
+        return matches[0][1] if matches else None
+
+    def first_paths(self, audio_ids):
+        """{audio_id: first path} for every audio ID that has a match."""
+        audio_paths = {}
+        for audio_id in audio_ids:
+            path = self.first_path(audio_id)
+            if path:
+                audio_paths[audio_id] = path
+        return audio_paths
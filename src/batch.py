@@ -0,0 +1,115 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+
+def default_workers():
+    """One worker per available CPU core."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _run_one(extract, audio_path):
+    """Run one extraction, returning (result, None, seconds) or (None, error message, seconds)."""
+    start = time.perf_counter()
+    try:
+        result = extract(audio_path)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+    return result, None, time.perf_counter() - start
+
+
+# Set in each worker process: where a chunk's start index is reported when the worker picks it up
+_started_chunks = None
+
+
+def _track_started(queue):
+    """Worker initializer: report started chunks to queue."""
+    global _started_chunks
+    _started_chunks = queue
+
+
+def _run_chunk(extract, audio_paths, start=None):
+    """Run one chunk of extractions inside a worker process."""
+    if _started_chunks is not None and start is not None:
+        _started_chunks.put(start)
+    return [_run_one(extract, audio_path) for audio_path in audio_paths]
+
+
+def _run_isolated(extract, audio_path):
+    """Run a single file in its own process so a hard crash only affects that file."""
+    try:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            return executor.submit(_run_one, extract, audio_path).result()
+    except BrokenProcessPool:
+        return None, "worker process crashed", None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", None
+
+
+def run_batch(extract, audio_paths, workers=None, chunksize=1, progress=None):
+    """Apply extract to every path across a process pool.
+
+    Returns a list of (result, error, seconds) outcomes in the same order as
+    audio_paths; seconds is the extraction time of that file. Exceptions are
+    caught per file. If a worker dies (e.g. a Praat segfault), the pool is
+    lost: the files of the chunks that were in flight are retried each in
+    its own fresh process (up to workers at a time), and the chunks that had
+    not started go to a new pool. progress(outcomes) is called with every group of finished files.
+    """
+    audio_paths = list(audio_paths)
+    workers = workers or default_workers()
+    chunksize = max(1, chunksize)
+    progress = progress or (lambda outcomes: None)
+
+    if workers == 1 or len(audio_paths) <= 1:
+        outcomes = []
+        for audio_path in audio_paths:
+            outcomes.append(_run_one(extract, audio_path))
+            progress(outcomes[-1:])
+        return outcomes
+
+    outcomes = [None] * len(audio_paths)
+    pending = list(range(0, len(audio_paths), chunksize))
+    while pending:
+        started_queue = multiprocessing.SimpleQueue()
+        finished = set()
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)), initializer=_track_started,
+                                 initargs=(started_queue,)) as executor:
+            futures = {}
+            for start in pending:
+                try:
+                    futures[executor.submit(_run_chunk, extract,
+                                            audio_paths[start:start + chunksize], start)] = start
+                except BrokenProcessPool:
+                    break
+            for future in as_completed(futures):
+                start = futures[future]
+                try:
+                    chunk_outcomes = future.result()
+                except BrokenProcessPool:
+                    continue
+                outcomes[start:start + len(chunk_outcomes)] = chunk_outcomes
+                finished.add(start)
+                progress(chunk_outcomes)
+        started = set()
+        while not started_queue.empty():
+            started.add(started_queue.get())
+
+        # Chunks in flight when the pool broke hold the crashing file; the rest never ran
+        crashed = [start for start in pending if start in started and start not in finished]
+        if not crashed and not finished:
+            crashed = pending  # the pool broke before any chunk started
+        isolated = [i for start in crashed for i in range(start, min(start + chunksize, len(audio_paths)))]
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            for i, outcome in zip(isolated, threads.map(
+                    lambda i: _run_isolated(extract, audio_paths[i]), isolated)):
+                outcomes[i] = outcome
+                progress([outcome])
+        pending = [start for start in pending if start not in finished and start not in crashed]
+
+    return outcomes
@@ -0,0 +1,235 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import parselmouth
+from utils import (extract_jitter, extract_shimmer, extract_fundamental_frequency, extract_hnr,
+                   extract_zero_crossing_rate, extract_voice_breaks, extract_all_features,
+                   spectral_hnr)
+from audio_analysis import AudioAnalysis
+from synthetic_voice import VoiceSpec, voice_fixture
+
+FIXTURE_DIR = "benchmarks/fixtures"
+RESULTS_PATH = "benchmarks/results.json"
+BASELINE_PATH = "benchmarks/baseline.json"
+DEFAULT_DURATIONS = [1, 10, 60]
+FULL_DURATIONS = [1, 10, 60, 300, 1800]
+REGRESSION_THRESHOLD = 0.10
+RSS_NOISE_MB = 16  # allocator noise: smaller memory growth is never a regression
+
+def extract_manual_hnr(audio_path):
+    """Mean spectral HNR (utils.spectral_hnr) over the voiced pitch frames, including the pitch track it needs.
+
+    Not an output column; benchmarked so it can be compared with 'hnr'.
+    """
+    analysis = AudioAnalysis.of(audio_path)
+    sound, pitch = analysis.sound, analysis.pitch
+    f0s = pitch.selected_array['frequency']
+    times = pitch.x1 + np.arange(len(f0s)) * pitch.dx
+    voiced = f0s > 0
+    frame_hnr = spectral_hnr(sound.values.mean(axis=0), sound.sampling_frequency,
+                             times[voiced], f0s[voiced], start_time=sound.x1)
+    return {'hnr_manual': float(np.nanmean(frame_hnr)) if np.isfinite(frame_hnr).any() else None}
+
+
+EXTRACTORS = {
+    'jitter': extract_jitter,
+    'shimmer': extract_shimmer,
+    'f0': extract_fundamental_frequency,
+    'hnr': extract_hnr,
+    'hnr_manual': extract_manual_hnr,
+    'zcr': extract_zero_crossing_rate,
+    'voice_breaks': extract_voice_breaks,
+    'all': extract_all_features,
+}
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _current_rss_mb():
+    """Resident set size right now in MB, or the peak where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return _peak_rss_mb()
+
+
+def _reset_peak_rss():
+    """Reset the peak RSS to the current RSS (Linux >= 4.0), so import spikes are not counted."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _measure(extractor, audio_paths, repeats, warmup):
+    """Run in a fresh process: per-call latencies and the peak RSS the extractor adds."""
+    extract = EXTRACTORS[extractor]
+    _reset_peak_rss()
+    baseline_rss = _current_rss_mb()
+    latencies = []
+    for audio_path in audio_paths:
+        for _ in range(warmup):
+            extract(audio_path)
+        for _ in range(repeats):
+            start = time.perf_counter()
+            extract(audio_path)
+            latencies.append(time.perf_counter() - start)
+    peak_rss = _peak_rss_mb()
+    return latencies, peak_rss, peak_rss - baseline_rss
+
+
+def summarize(latencies, peak_rss, extra_rss):
+    """Latency percentiles (seconds) and memory (MB) of one extractor/duration cell."""
+    latencies = np.asarray(latencies)
+    return {
+        'n': len(latencies),
+        'mean': float(latencies.mean()),
+        'min': float(latencies.min()),
+        'p50': float(np.percentile(latencies, 50)),
+        'p90': float(np.percentile(latencies, 90)),
+        'p99': float(np.percentile(latencies, 99)),
+        'peak_rss_mb': round(peak_rss, 1),
+        'extra_rss_mb': round(extra_rss, 1),
+    }
+
+
+def environment():
+    """Machine and library versions recorded with every result file."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'parselmouth': parselmouth.__version__,
+    }
+
+
+def run_benchmarks(extractors, durations, files, repeats, warmup, fixture_dir=FIXTURE_DIR):
+    """{'<extractor>@<duration>s': summary}; every cell runs in its own process so peak RSS is its own."""
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for duration in durations:
+        audio_paths = [voice_fixture(VoiceSpec(duration, seed=seed), fixture_dir)
+                       for seed in range(files)]
+        for extractor in extractors:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                latencies, peak_rss, extra_rss = pool.submit(
+                    _measure, extractor, audio_paths, repeats, warmup).result()
+            key = f"{extractor}@{duration:g}s"
+            results[key] = summarize(latencies, peak_rss, extra_rss)
+            print(f"{key:<20} p50 {results[key]['p50']:9.4f}s  p90 {results[key]['p90']:9.4f}s  "
+                  f"p99 {results[key]['p99']:9.4f}s  +RSS {results[key]['extra_rss_mb']:8.1f} MB")
+    return results
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print p50 latency and memory ratios against a baseline; return the regressed cells."""
+    regressions = []
+    print(f"\n{'cell':<20} {'p50 new/old':>12} {'+RSS new/old':>13}")
+    for key, summary in results.items():
+        if key not in baseline:
+            continue
+        old = baseline[key]
+        time_ratio = summary['p50'] / old['p50'] if old['p50'] else float('nan')
+        rss_ratio = (summary['extra_rss_mb'] / old['extra_rss_mb']
+                     if old['extra_rss_mb'] > 1 else float('nan'))
+        rss_growth = summary['extra_rss_mb'] - old['extra_rss_mb']
+        flag = ''
+        if (time_ratio > 1 + threshold
+                or (rss_growth > RSS_NOISE_MB and rss_growth > threshold * old['extra_rss_mb'])):
+            regressions.append(key)
+            flag = '  REGRESSION'
+        print(f"{key:<20} {time_ratio:12.2f} {rss_ratio:13.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time every utils.py extractor on synthetic voice fixtures.")
+    parser.add_argument('--extractors', nargs='+', choices=list(EXTRACTORS), default=list(EXTRACTORS),
+                        help="Extractors to benchmark (default: all)")
+    parser.add_argument('--durations', nargs='+', type=float, default=DEFAULT_DURATIONS,
+                        help=f"Fixture durations in seconds (default: {DEFAULT_DURATIONS})")
+    parser.add_argument('--full', action='store_true',
+                        help=f"Use durations {FULL_DURATIONS} (up to 30 minutes)")
+    parser.add_argument('--files', type=int, default=3,
+                        help="Fixtures per duration, with different seeds (default: 3)")
+    parser.add_argument('--repeats', type=int, default=3,
+                        help="Timed calls per fixture (default: 3)")
+    parser.add_argument('--warmup', type=int, default=1,
+                        help="Untimed calls per fixture before timing (default: 1)")
+    parser.add_argument('--output', default=RESULTS_PATH,
+                        help=f"Where to write this run's results (default: {RESULTS_PATH})")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f"Also store this run as the baseline ({BASELINE_PATH})")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_PATH,
+                        help="Compare against a baseline JSON (default path if no value given)")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative slowdown or memory growth that counts as a regression (default: 0.10)")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Exit with status 1 if any cell regressed")
+    args = parser.parse_args()
+
+    # Read the baseline before anything is written, since --save-baseline or --output may overwrite it
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    durations = FULL_DURATIONS if args.full else args.durations
+    results = run_benchmarks(args.extractors, durations, args.files, args.repeats, args.warmup)
+    report = {'environment': environment(),
+              'settings': {'durations': durations, 'files': args.files,
+                           'repeats': args.repeats, 'warmup': args.warmup},
+              'results': results}
+
+    for path in [args.output] + ([BASELINE_PATH] if args.save_baseline else []):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to {path}")
+
+    if baseline is not None:
+        print(f"Baseline: {args.compare} (commit {baseline['environment'].get('commit')}, "
+              f"{baseline['environment']['timestamp']})")
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+        else:
+            print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+from batch import default_workers
+from run_manifest import DEFAULT_FLUSH_EVERY
+from pitch_config import PitchConfig, PITCH_PRESETS, PITCH_METHODS
+from trim import TrimConfig, TRIM_THRESHOLD_DB, TRIM_PADDING_SECONDS
+from run_log import QUIET, NORMAL, VERBOSE
+
+
+def build_parser(description, pitch=False):
+    """Argument parser with the options shared by the extract_*.py scripts.
+
+    pitch=True adds the pitch analysis and pitch store options for scripts
+    that read a pitch track.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help="Number of worker processes (default: all CPU cores; 1 runs in-process)")
+    parser.add_argument('--chunksize', type=int, default=4,
+                        help="Files handed to a worker at a time (default: 4)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Do not read or write the on-disk feature cache")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Recompute every file and overwrite its cached features (implies --restart)")
+    parser.add_argument('--restart', action='store_true',
+                        help="Discard the run manifest instead of resuming from it")
+    parser.add_argument('--flush-every', type=int, default=DEFAULT_FLUSH_EVERY,
+                        help=f"Checkpoint results after this many files (default: {DEFAULT_FLUSH_EVERY})")
+    parser.add_argument('--audio-index', metavar='PATH',
+                        help="Read audio paths from a saved index such as the ingest manifest instead of scanning the audio folders")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('-q', '--quiet', action='store_true',
+                           help="No progress display; print only the final summary")
+    verbosity.add_argument('-v', '--verbose', action='store_true',
+                           help="Also print one line per file")
+    parser.add_argument('--trace', action='store_true',
+                        help="Time every extraction stage per file into a JSONL trace and print a summary")
+    parser.add_argument('--profile-every', type=int, default=0, metavar='N',
+                        help="Also run about one file in N under cProfile, writing .prof files (implies --trace)")
+    if pitch:
+        add_pitch_options(parser)
+    return parser
+
+
+def add_pitch_options(parser):
+    """Add the pitch analysis, pitch store and silence trimming options."""
+    parser.add_argument('--pitch-store', action='store_true',
+                        help="Reuse stored pitch contours across scripts; only for features that need "
+                             "nothing but the contour (F0, voice breaks, frame-level tracks)")
+    parser.add_argument('--pitch-preset', choices=list(PITCH_PRESETS), default='default',
+                        help="Pitch search range for the speaker group (default: 75-600 Hz)")
+    parser.add_argument('--pitch-floor', type=float,
+                        help="Pitch floor in Hz (overrides the preset)")
+    parser.add_argument('--pitch-ceiling', type=float,
+                        help="Pitch ceiling in Hz (overrides the preset)")
+    parser.add_argument('--pitch-time-step', type=float,
+                        help="Pitch frame step in seconds (default: 0.75 / floor)")
+    parser.add_argument('--pitch-method', choices=PITCH_METHODS, default='ac',
+                        help="Pitch algorithm: autocorrelation, cross-correlation or subharmonic summation (default: ac)")
+    parser.add_argument('--two-pass-pitch', action='store_true',
+                        help="Estimate each speaker's pitch range with a coarse first pass, then track within it")
+    parser.add_argument('--trim-silence', action='store_true',
+                        help="Crop leading and trailing silence before pitch and harmonicity analysis")
+    parser.add_argument('--trim-threshold-db', type=float, default=TRIM_THRESHOLD_DB,
+                        help=f"Frames this many dB below the loudest frame count as silence (default: {TRIM_THRESHOLD_DB:g})")
+    parser.add_argument('--trim-padding', type=float, default=TRIM_PADDING_SECONDS,
+                        help=f"Seconds kept on each side of the active region (default: {TRIM_PADDING_SECONDS:g})")
+    parser.add_argument('--keep-trimmed-silence', action='store_true',
+                        help="Count trimmed silence as unvoiced in the voiced/unvoiced percentages")
+
+
+def verbosity_from_args(args):
+    """QUIET, NORMAL or VERBOSE from the -q/-v options."""
+    if args.quiet:
+        return QUIET
+    return VERBOSE if args.verbose else NORMAL
+
+
+def pitch_config_from_args(args):
+    """PitchConfig from the --pitch-* and --trim-* options."""
+    overrides = {'time_step': args.pitch_time_step, 'method': args.pitch_method,
+                 'two_pass': args.two_pass_pitch}
+    if args.trim_silence:
+        overrides['trim'] = TrimConfig(args.trim_threshold_db, args.trim_padding,
+                                       keep_silence_in_voicing=args.keep_trimmed_silence)
+    if args.pitch_floor is not None:
+        overrides['floor'] = args.pitch_floor
+    if args.pitch_ceiling is not None:
+        overrides['ceiling'] = args.pitch_ceiling
+    return PitchConfig.preset(args.pitch_preset, **overrides)
@@ -0,0 +1,100 @@
+import os
+import argparse
+import pandas as pd
+from audio_index import AudioIndex
+from batch import run_batch, default_workers
+from cli import add_pitch_options, pitch_config_from_args
+from run_manifest import DEFAULT_FLUSH_EVERY
+from run_log import Progress
+from track_store import TrackStore, TrackExtractor, TRACK_NAMES
+from extract_features import CSV_PATH, AUDIO_BASE, INDEX_PATH, PITCH_STORE_PATH
+
+TRACK_STORE_PATH = "features/track_store"
+
+
+def read_audio_ids(csv_path):
+    """Audio IDs of the label table, tab- or comma-separated."""
+    df = pd.read_csv(csv_path, sep='\t')
+    if len(df.columns) == 1:
+        df = pd.read_csv(csv_path, sep=',')
+    df.columns = df.columns.str.strip()
+    return df['audio_audio.m4a'].astype(str).tolist()
+
+
+def source_meta(audio_path, names, params):
+    """What a stored entry was computed from; an entry with different metadata is re-exported."""
+    stat = os.stat(audio_path)
+    return {'audio_path': audio_path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'names': list(names), 'params': params}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Store frame-level pitch, voicing, ZCR, HNR and intensity tracks for every audio file.")
+    parser.add_argument('--tracks', nargs='+', choices=TRACK_NAMES, default=list(TRACK_NAMES),
+                        help="Tracks to store (default: all)")
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help="Number of worker processes (default: all CPU cores; 1 runs in-process)")
+    parser.add_argument('--chunksize', type=int, default=4,
+                        help="Files handed to a worker at a time (default: 4)")
+    parser.add_argument('--flush-every', type=int, default=DEFAULT_FLUSH_EVERY,
+                        help=f"Commit stored tracks after this many files (default: {DEFAULT_FLUSH_EVERY})")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Recompute every file, even if its tracks are up to date")
+    parser.add_argument('--audio-index', metavar='PATH',
+                        help="Read audio paths from a saved index such as the ingest manifest instead of scanning the audio folders")
+    parser.add_argument('--output', default=TRACK_STORE_PATH,
+                        help=f"Track store directory (default: {TRACK_STORE_PATH})")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="No progress display")
+    add_pitch_options(parser)
+    args = parser.parse_args()
+
+    pitch_config = pitch_config_from_args(args)
+    params = pitch_config.params()
+    audio_ids = read_audio_ids(CSV_PATH)
+    if args.audio_index:
+        audio_index = AudioIndex.load(args.audio_index)
+    else:
+        audio_index = AudioIndex.load_or_build(AUDIO_BASE, INDEX_PATH)
+    audio_paths = audio_index.first_paths(audio_ids)
+    print(f"Found {len(audio_paths)} audio files for {len(audio_ids)} audio IDs")
+
+    # Files whose stored tracks came from the same audio, tracks and settings are skipped
+    store = TrackStore(args.output)
+    pending = []
+    for audio_id, audio_path in audio_paths.items():
+        meta = source_meta(audio_path, args.tracks, params)
+        entry = store.entry(audio_id)
+        if args.refresh or entry is None or any(entry.get(key) != value for key, value in meta.items()):
+            pending.append((audio_id, audio_path, meta))
+    print(f"{len(audio_paths) - len(pending)} up to date, {len(pending)} to export")
+
+    extract = TrackExtractor(args.tracks, pitch_config,
+                             PITCH_STORE_PATH if args.pitch_store else None)
+    progress = Progress(len(pending), enabled=not args.quiet)
+    failed = []
+    for start in range(0, len(pending), args.flush_every):
+        batch = pending[start:start + args.flush_every]
+        outcomes = run_batch(extract, [audio_path for _, audio_path, _ in batch],
+                             args.workers, args.chunksize, progress)
+        for (audio_id, audio_path, meta), (tracks, error, seconds) in zip(batch, outcomes):
+            if error:
+                failed.append((audio_id, error))
+                continue
+            store.append(audio_id, tracks, **meta)
+        store.commit()
+    progress.close()
+
+    print(f"\n📈 Track Export Summary:")
+    print(f"   Exported: {len(pending) - len(failed)}")
+    print(f"   Up to date: {len(audio_paths) - len(pending)}")
+    print(f"   Failed: {len(failed)}")
+    print(f"   IDs in store: {len(store)}")
+    for audio_id, error in failed:
+        print(f"   ❌ {audio_id}: {error}")
+    print(f"\n📝 Tracks saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+from extract_features import main
+from registry import FEATURE_FAMILIES
+
+
+if __name__ == "__main__":
+    main(list(FEATURE_FAMILIES))
@@ -0,0 +1,288 @@
+import os
+import pandas as pd
+from registry import (FEATURE_FAMILIES, FamilyExtractor, resolve_families, required_intermediates,
+                      contour_only)
+from audio_index import AudioIndex
+from feature_cache import FeatureCache
+from run_manifest import RunManifest, run_resumable
+from cli import build_parser, pitch_config_from_args, verbosity_from_args
+from feature_store import FeatureStore
+from streaming import extract_all_features_streaming
+from pitch_store import PitchStoreExtractor
+from pitch_config import PitchConfigExtractor
+from run_log import RunLog, Progress, NORMAL
+from prescreen import PRESCREEN_STATUS_KEY, REJECTED_STATUSES
+from stage_timer import StageTimer, TracedExtractor, append_trace, load_trace, print_trace_summary
+
+CSV_PATH = "all_audios_mapped_id_for_label/final_selected.csv"
+AUDIO_BASE = "Processed_data_sample_raw_voice/raw_wav"
+OUTPUT_PATH = "features/{run_name}_features.csv"
+LOG_PATH = "features/{run_name}_run_log.jsonl"
+INDEX_PATH = "features/audio_index.json"
+CACHE_PATH = "features/feature_cache.sqlite"
+STORE_PATH = "features/feature_store"
+MANIFEST_PATH = "features/{run_name}_run_manifest.jsonl"
+TRACE_PATH = "features/{run_name}_trace.jsonl"
+PROFILE_DIR = "features/profiles/{run_name}"
+PITCH_STORE_PATH = "features/pitch_tracks"
+
+
+def run_name(families):
+    """File name prefix for a set of families: 'all', the family name, or names joined by '_'."""
+    if len(families) == len(FEATURE_FAMILIES):
+        return 'all'
+    return '_'.join(family.name for family in families)
+
+
+def uses_pitch_config(names):
+    """Whether any of the families reads the pitch or trim settings."""
+    return bool(required_intermediates(names) & {'active_sound', 'active_region'})
+
+
+def build_extractor(args, families):
+    """(extract, cache params) for the chosen families and the pitch command-line options."""
+    names = [family.name for family in families]
+    pitch_config = pitch_config_from_args(args)
+    if args.streaming:
+        extract = PitchConfigExtractor(extract_all_features_streaming, pitch_config)
+    elif not uses_pitch_config(names):
+        return FamilyExtractor(names), {}
+    elif args.pitch_store and contour_only(names):
+        # Opt-in: a stored contour is enough for these families
+        extract = PitchStoreExtractor(FamilyExtractor(names), PITCH_STORE_PATH, pitch_config)
+    else:
+        extract = PitchConfigExtractor(FamilyExtractor(names), pitch_config)
+    return extract, pitch_config.params()
+
+
+def build_run_parser(family_names=None):
+    """(parser, pitch_options) of an extraction script for the given families (default: chosen with --features)."""
+    # Pitch and trim options only for runs that can involve a pitch track or trimming
+    pitch_options = family_names is None or uses_pitch_config(family_names)
+    if family_names is None:
+        description = "Extract the selected feature families for every audio file."
+    else:
+        description = f"Extract {', '.join(family_names)} features for every audio file."
+    parser = build_parser(description, pitch=pitch_options)
+    if family_names is None:
+        parser.add_argument('--features', nargs='+', choices=list(FEATURE_FAMILIES),
+                            help="Feature families to extract (default: all)")
+    if pitch_options:
+        parser.add_argument('--streaming', action='store_true',
+                            help="Read each file in overlapping blocks so memory stays flat on very long recordings "
+                                 "(the pulse-based jitter/shimmer columns are left empty; the *_manual ones are kept)")
+    return parser, pitch_options
+
+
+def main(family_names=None):
+    """Extract the given feature families (default: chosen with --features) for every audio file."""
+    parser, pitch_options = build_run_parser(family_names)
+    args = parser.parse_args()
+
+    families = resolve_families(family_names or args.features)
+    name = run_name(families)
+    output_path = OUTPUT_PATH.format(run_name=name)
+    log_path = LOG_PATH.format(run_name=name)
+    manifest_path = MANIFEST_PATH.format(run_name=name)
+    if pitch_options:
+        extract, params = build_extractor(args, families)
+    else:
+        extract, params = FamilyExtractor([family.name for family in families]), {}
+
+    # Opt-in per-stage timing: workers append one record per extracted file
+    run_timer = StageTimer()
+    trace_path = None
+    if args.trace or args.profile_every:
+        trace_path = TRACE_PATH.format(run_name=name)
+        os.makedirs(os.path.dirname(trace_path), exist_ok=True)
+        open(trace_path, 'w').close()
+        profile_dir = PROFILE_DIR.format(run_name=name) if args.profile_every else None
+        extract = TracedExtractor(extract, trace_path, profile_dir, args.profile_every)
+
+    # Try reading as tab-separated first
+    with run_timer.stage('read_csv'):
+        df = pd.read_csv(CSV_PATH, sep='\t')
+        df.columns = df.columns.str.strip()
+
+        # If only one column, try comma-separated
+        if len(df.columns) == 1:
+            print("Detected only one column. Trying comma as delimiter...")
+            df = pd.read_csv(CSV_PATH, sep=',')
+            df.columns = df.columns.str.strip()
+
+    if 'audio_audio.m4a' not in df.columns:
+        print('Column names:', df.columns.tolist())
+        print("ERROR: 'audio_audio.m4a' column not found!")
+        exit(1)
+
+    os.makedirs("features", exist_ok=True)
+    run_log = RunLog(log_path, verbosity_from_args(args))
+    run_log.event('run_start', run=name, families=[family.name for family in families],
+                  extractor=extract.__name__, params=params)
+    if pitch_options and args.streaming and args.trim_silence:
+        run_log.info("⚠️  --trim-silence is not applied with --streaming; every block is analysed")
+    selected = {family.name for family in families}
+    if pitch_options and args.pitch_store and not args.streaming:
+        if {'jitter', 'shimmer'} & selected:
+            run_log.info("⚠️  --pitch-store is not used: jitter/shimmer place glottal pulses with "
+                         "Praat's own Pitch, which a stored contour cannot provide")
+        elif not contour_only(selected) and selected != {'hnr'}:
+            run_log.info("⚠️  --pitch-store is not used: none of these families reads a pitch track")
+        if 'hnr' in selected:
+            run_log.info("ℹ️  HNR is measured on the audio with Praat's Harmonicity and does not use "
+                         "a pitch track")
+    if pitch_options and args.streaming and {'jitter', 'shimmer'} & selected:
+        run_log.info("⚠️  Jitter/shimmer need a whole-file PointProcess: with --streaming only "
+                     "jitter_manual and shimmer_manual are computed")
+
+    # Extract audio IDs (the column contains just the ID numbers)
+    audio_ids = df['audio_audio.m4a'].astype(str).tolist()
+    run_log.info(f"Found {len(audio_ids)} audio IDs to process")
+
+    # Find audio paths (the ID index is built once and reused across runs)
+    with run_timer.stage('discovery'):
+        if args.audio_index:
+            audio_index = AudioIndex.load(args.audio_index)
+        else:
+            audio_index = AudioIndex.load_or_build(AUDIO_BASE, INDEX_PATH)
+        audio_paths = audio_index.first_paths(audio_ids)
+    run_log.info(f"Found {len(audio_paths)} audio files")
+
+    # Extract features in parallel, resuming from the run manifest and
+    # serving unchanged files from the cache
+    found_paths = list(dict.fromkeys(audio_paths.values()))
+    cache = None if args.no_cache else FeatureCache(CACHE_PATH)
+    manifest = RunManifest(manifest_path, restart=args.restart or args.refresh)
+    progress = Progress(len(found_paths), enabled=run_log.verbosity >= NORMAL)
+    with run_timer.stage('extraction'):
+        outcomes = run_resumable(
+            manifest, extract, found_paths, flush_every=args.flush_every, log=run_log,
+            cache=cache, params=params, refresh=args.refresh,
+            workers=args.workers, chunksize=args.chunksize, progress=progress)
+    progress.close()
+
+    # One run log record per audio ID
+    keys = [key for family in families for key in family.keys]
+    results = []
+    for audio_id in audio_ids:
+        if audio_id not in audio_paths:
+            run_log.file(audio_id, 'not_found', reason="Audio file not found")
+            continue
+
+        audio_path = audio_paths[audio_id]
+        features, batch_error, seconds = outcomes[audio_path]
+        if batch_error:
+            run_log.file(audio_id, 'failed', audio_path, f"Error extracting features: {batch_error}",
+                         seconds)
+            continue
+
+        # Too-short and silent files were rejected before any Praat analysis;
+        # their row keeps the status with empty features
+        prescreen_status = features.get(PRESCREEN_STATUS_KEY)
+        if prescreen_status in REJECTED_STATUSES:
+            results.append({
+                'audio_id': audio_id,
+                'audio_path': audio_path,
+                PRESCREEN_STATUS_KEY: prescreen_status,
+                **{key: None for key in keys}
+            })
+            run_log.file(audio_id, prescreen_status, audio_path,
+                         f"Rejected by prescreen: {prescreen_status}", seconds)
+            continue
+
+        # Families where at least one value was computed
+        successful_families = [
+            family.name for family in families
+            if any(features[key] is not None for key in family.keys)]
+        if not successful_families:
+            run_log.file(audio_id, 'failed', audio_path,
+                         "Feature extraction failed - no family succeeded", seconds)
+            continue
+
+        results.append({
+            'audio_id': audio_id,
+            'audio_path': audio_path,
+            PRESCREEN_STATUS_KEY: prescreen_status,
+            **{key: features[key] for key in keys}
+        })
+        run_log.file(audio_id, 'ok', audio_path, seconds=seconds,
+                     n_features=sum(features[key] is not None for key in keys),
+                     families=successful_families)
+
+    # Files the prescreen rejected were screened out on purpose; they are not failures
+    success_count = run_log.counts.get('ok', 0)
+    rejected = {status: run_log.counts[status] for status in REJECTED_STATUSES
+                if status in run_log.counts}
+    error_count = len(audio_ids) - success_count - sum(rejected.values())
+
+    # Create results DataFrame
+    if results:
+        results_df = pd.DataFrame(results)
+
+        # Add original data
+        final_df = df.copy()
+        # Convert audio_id to string for proper merging
+        final_df['audio_audio.m4a'] = final_df['audio_audio.m4a'].astype(str)
+        results_df['audio_id'] = results_df['audio_id'].astype(str)
+        final_df = final_df.merge(
+            results_df, left_on='audio_audio.m4a', right_on='audio_id', how='left')
+
+        # Save results
+        with run_timer.stage('write_csv'):
+            final_df.to_csv(output_path, index=False)
+        run_log.info(f"\n✅ Results saved to {output_path}")
+
+        # Update the shared columnar feature store, one namespace per family
+        with run_timer.stage('feature_store'):
+            feature_store = FeatureStore(STORE_PATH)
+            for family in families:
+                feature_store.upsert(family.name, {
+                    result['audio_id']: {key: result[key] for key in family.keys}
+                    for result in results})
+        run_log.info(f"✅ Feature store updated at {STORE_PATH}")
+
+        # Print summary statistics
+        print(f"\n📊 Extraction Summary:")
+        print(f"   Total files processed: {len(audio_ids)}")
+        print(f"   Files found: {len(audio_paths)}")
+        print(f"   Successful extractions: {success_count}")
+        print(f"   Failed extractions: {error_count}")
+        if rejected:
+            print(f"   Rejected by prescreen: "
+                  f"{', '.join(f'{count} {status}' for status, count in rejected.items())}")
+        print(f"   Success rate: {(success_count/len(audio_ids)*100):.1f}%")
+
+        # Per-feature coverage and mean over the files that were analysed
+        analysed_df = results_df[~results_df[PRESCREEN_STATUS_KEY].isin(REJECTED_STATUSES)]
+        run_log.info(f"\n📈 Feature coverage:")
+        for key in keys:
+            count = analysed_df[key].notna().sum()
+            mean = f", mean {analysed_df[key].mean():.4g}" if count else ""
+            run_log.info(f"   {key}: {count}/{len(analysed_df)} "
+                         f"({count/max(len(analysed_df), 1)*100:.1f}%){mean}")
+    else:
+        print("❌ No features were successfully extracted!")
+
+    # Outputs are written: drop the checkpoint, unless failed files are left to retry
+    retry_count = sum(1 for _, batch_error, _ in outcomes.values() if batch_error)
+    if retry_count:
+        run_log.info(f"🔁 {retry_count} files raised errors; rerun to retry only them "
+                     f"(progress kept in {manifest_path})")
+    else:
+        manifest.finalize()
+
+    run_log.close(run=name, files=len(audio_ids), stages=run_timer.record()['stages'])
+    print(f"\n📝 Run log saved to {log_path}")
+    if error_count:
+        print(f"🔍 {error_count} files failed; see the records whose status is 'failed' or 'not_found'")
+
+    if trace_path:
+        append_trace(trace_path, {'run': name, **run_timer.record()})
+        print_trace_summary(load_trace(trace_path), run_timer.stages)
+        print(f"\n📝 Stage trace saved to {trace_path}")
+        if args.profile_every:
+            print(f"🔍 cProfile stats in {PROFILE_DIR.format(run_name=name)} (python -m pstats <file>.prof)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import numpy as np
+from batch import run_batch
+
+
+CACHE_VERSION = 11
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_HASH_BLOCK = 1024 * 1024
+
+
+def json_default(value):
+    """json.dumps default hook for numpy scalars and arrays."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def file_digest(audio_path):
+    """SHA-256 of the file contents."""
+    digest = hashlib.sha256()
+    with open(audio_path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """On-disk SQLite cache of extractor results keyed by file content, extractor and parameters."""
+
+    def __init__(self, cache_path, max_bytes=DEFAULT_MAX_BYTES):
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(cache_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS features (
+                key TEXT PRIMARY KEY,
+                extractor TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                value TEXT NOT NULL,
+                nbytes INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS features_last_access ON features(last_access);
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def fingerprint(self, audio_path):
+        """Content digest of a file, reusing the stored one while its size and mtime are unchanged."""
+        stat = os.stat(audio_path)
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, digest FROM fingerprints WHERE path = ?",
+            (audio_path,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        digest = file_digest(audio_path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?)",
+            (audio_path, stat.st_size, stat.st_mtime_ns, digest))
+        self.conn.commit()
+        return digest
+
+    @staticmethod
+    def make_key(digest, extractor, params=None):
+        """Cache key for one (file content, extractor, parameters) combination."""
+        params_json = json.dumps(params or {}, sort_keys=True, default=json_default)
+        raw = f"{CACHE_VERSION}|{digest}|{extractor}|{params_json}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key):
+        """Cached value for key, or None on a miss. Hits refresh the LRU timestamp."""
+        row = self.conn.execute(
+            "SELECT value FROM features WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.conn.execute(
+            "UPDATE features SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key, extractor, digest, value):
+        """Store a value; call commit() and evict() once the batch is done."""
+        value_json = json.dumps(value, default=json_default)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?)",
+            (key, extractor, digest, value_json, len(value_json), time.time()))
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes."""
+        total = self.conn.execute(
+            "SELECT COALESCE(SUM(nbytes), 0) FROM features").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        evicted = 0
+        for key, nbytes in self.conn.execute(
+                "SELECT key, nbytes FROM features ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM features WHERE key = ?", (key,))
+            total -= nbytes
+            evicted += 1
+        self.conn.commit()
+        return evicted
+
+    def commit(self):
+        self.conn.commit()
+
+
+def run_cached_batch(extract, audio_paths, cache=None, params=None, refresh=False, **batch_kwargs):
+    """run_batch with cache lookups: unchanged files are served without decoding.
+
+    With cache=None this is plain run_batch. With refresh=True every file is
+    recomputed and the cached values are overwritten. Cache hits have
+    seconds=None in their outcome.
+    """
+    audio_paths = list(audio_paths)
+    if cache is None:
+        return run_batch(extract, audio_paths, **batch_kwargs)
+
+    extractor = extract.__name__
+    outcomes = [None] * len(audio_paths)
+    keys = [None] * len(audio_paths)
+    digests = [None] * len(audio_paths)
+    misses = []
+    for i, audio_path in enumerate(audio_paths):
+        try:
+            digests[i] = cache.fingerprint(audio_path)
+        except OSError:
+            misses.append(i)
+            continue
+        keys[i] = FeatureCache.make_key(digests[i], extractor, params)
+        value = None if refresh else cache.get(keys[i])
+        if value is None:
+            misses.append(i)
+        else:
+            outcomes[i] = (value, None, None)
+    hits = [outcome for outcome in outcomes if outcome is not None]
+    if hits and batch_kwargs.get('progress'):
+        batch_kwargs['progress'](hits)
+
+    computed = run_batch(extract, [audio_paths[i] for i in misses], **batch_kwargs)
+    for i, (value, error, seconds) in zip(misses, computed):
+        outcomes[i] = (value, error, seconds)
+        if error is None and keys[i] is not None:
+            cache.put(keys[i], extractor, digests[i], value)
+    cache.commit()
+    cache.evict()
+    return outcomes
@@ -0,0 +1,117 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+
+STORE_VERSION = 1
+COLUMN_DTYPE = np.dtype('<f4')
+_MANIFEST = 'manifest.json'
+
+
+class FeatureStore:
+    """Columnar feature table: one row per audio ID, one float32 file per 'family.feature' column.
+
+    Columns are raw little-endian float32 files that can be memory-mapped
+    individually. New rows are appended to every column file, and a new
+    column is a new file. Neither rewrites existing data. The manifest
+    (row IDs, column list) is the source of truth and is replaced
+    atomically, so bytes left behind by an interrupted write are ignored.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        manifest_path = os.path.join(store_dir, _MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') != STORE_VERSION:
+                raise ValueError(
+                    f"Unsupported feature store version: {manifest.get('version')}")
+        else:
+            manifest = {'version': STORE_VERSION, 'ids': [], 'columns': {}}
+        self.ids = manifest['ids']
+        self.columns = manifest['columns']
+        self.row_of = {audio_id: row for row, audio_id in enumerate(self.ids)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _column_path(self, name):
+        return os.path.join(self.store_dir, name + '.f32')
+
+    def _save_manifest(self):
+        manifest_path = os.path.join(self.store_dir, _MANIFEST)
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': STORE_VERSION, 'ids': self.ids,
+                       'columns': self.columns}, f)
+        os.replace(tmp_path, manifest_path)
+
+    def _resize_column(self, name, committed_rows, n_rows):
+        """Drop bytes past committed_rows, then pad the column with NaN up to n_rows."""
+        with open(self._column_path(name), 'ab') as f:
+            f.truncate(committed_rows * COLUMN_DTYPE.itemsize)
+            np.full(n_rows - committed_rows, np.nan, dtype=COLUMN_DTYPE).tofile(f)
+
+    def family_columns(self, family):
+        """Column names ('family.feature') belonging to one feature family."""
+        return [name for name, meta in self.columns.items() if meta['family'] == family]
+
+    def upsert(self, family, rows):
+        """Write {audio_id: {feature: value}} into the family's columns.
+
+        Existing IDs are updated in place, unknown IDs become new rows, and
+        unknown features become new columns (NaN for all other rows).
+        """
+        rows = {str(audio_id): values for audio_id, values in rows.items()}
+        new_ids = [audio_id for audio_id in rows if audio_id not in self.row_of]
+        n_rows = len(self.ids) + len(new_ids)
+
+        # Grow every existing column to the new row count
+        for name in self.columns:
+            self._resize_column(name, len(self.ids), n_rows)
+
+        # Create columns for features this store has not seen yet
+        features = list(dict.fromkeys(
+            feature for values in rows.values() for feature in values))
+        for feature in features:
+            name = f"{family}.{feature}"
+            if name not in self.columns:
+                self._resize_column(name, 0, n_rows)
+                self.columns[name] = {'family': family, 'feature': feature,
+                                      'dtype': COLUMN_DTYPE.name}
+
+        for audio_id in new_ids:
+            self.row_of[audio_id] = len(self.ids)
+            self.ids.append(audio_id)
+
+        # Scatter the values into memory-mapped columns
+        if n_rows:
+            row_indices = np.array([self.row_of[audio_id] for audio_id in rows])
+            for feature in features:
+                column = np.memmap(self._column_path(f"{family}.{feature}"),
+                                   dtype=COLUMN_DTYPE, mode='r+', shape=(n_rows,))
+                column[row_indices] = [
+                    np.nan if values.get(feature) is None else values[feature]
+                    for values in rows.values()]
+                column.flush()
+                del column
+
+        self._save_manifest()
+
+    def column(self, name):
+        """Read-only memory map of one column, aligned with self.ids."""
+        if name not in self.columns:
+            raise KeyError(f"No column {name!r} in feature store {self.store_dir}")
+        if not self.ids:
+            return np.empty(0, dtype=COLUMN_DTYPE)
+        return np.memmap(self._column_path(name), dtype=COLUMN_DTYPE,
+                         mode='r', shape=(len(self.ids),))
+
+    def to_dataframe(self, columns=None):
+        """Load the chosen columns (default: all) into a DataFrame indexed by audio_id."""
+        columns = list(self.columns) if columns is None else columns
+        return pd.DataFrame({name: np.asarray(self.column(name)) for name in columns},
+                            index=pd.Index(self.ids, name='audio_id'))
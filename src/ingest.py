@@ -0,0 +1,176 @@
+import os
+import sys
+import time
+import shutil
+import struct
+import argparse
+import subprocess
+from audio_index import AudioIndex, LABEL_FOLDERS, scan_audio_files
+from batch import run_batch, default_workers
+from wav_io import read_wav_header
+from run_log import Progress
+
+SOURCE_BASE = "Processed_data_sample_raw_voice/raw_audio"
+OUTPUT_BASE = "Processed_data_sample_raw_voice/raw_wav"
+MANIFEST_PATH = "features/ingest_manifest.json"
+SOURCE_EXTENSIONS = ('.m4a', '.mp3', '.flac', '.M4A', '.MP3', '.FLAC')
+DEFAULT_SAMPLE_RATE = 16000
+DECODER = 'ffmpeg'
+
+
+def output_path(source_path, source_dir, output_dir):
+    """Where a source file's WAV goes: the same relative path under output_dir, with a .wav extension."""
+    relative = os.path.relpath(source_path, source_dir)
+    return os.path.join(output_dir, os.path.splitext(relative)[0] + '.wav')
+
+
+def is_up_to_date(source_path, wav_path, sample_rate):
+    """Whether wav_path is a mono WAV at sample_rate written after the source was last modified."""
+    try:
+        if os.stat(wav_path).st_mtime_ns < os.stat(source_path).st_mtime_ns:
+            return False
+        info = read_wav_header(wav_path)
+    except (OSError, ValueError, struct.error):
+        return False
+    return info.channels == 1 and info.sampling_frequency == sample_rate and info.n_frames > 0
+
+
+class Transcoder:
+    """Picklable source -> mono 16-bit PCM WAV conversion with a decoder binary (ffmpeg), for run_batch.
+
+    The WAV is written next to its final path and renamed into place, so
+    an interrupted run never leaves a truncated file that looks up to date.
+    Returns the WAV path; a decoder failure raises RuntimeError with its
+    message.
+    """
+
+    def __init__(self, source_dir, output_dir, sample_rate=DEFAULT_SAMPLE_RATE, decoder=DECODER):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.decoder = decoder
+        self.__name__ = f"transcode[{sample_rate}]"
+
+    def __call__(self, source_path):
+        wav_path = output_path(source_path, self.source_dir, self.output_dir)
+        os.makedirs(os.path.dirname(wav_path), exist_ok=True)
+        tmp_path = wav_path + '.part'
+        # One decoder thread per file: run_batch already keeps every core busy
+        command = [self.decoder, '-nostdin', '-hide_banner', '-loglevel', 'error', '-y',
+                   '-threads', '1', '-i', source_path, '-vn', '-map_metadata', '-1',
+                   '-ac', '1', '-ar', str(self.sample_rate), '-c:a', 'pcm_s16le',
+                   '-bitexact', '-f', 'wav', tmp_path]
+        completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if completed.returncode != 0:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            message = completed.stderr.decode(errors='replace').strip().splitlines()
+            raise RuntimeError(message[-1] if message else f"decoder exited with {completed.returncode}")
+        os.replace(tmp_path, wav_path)
+        return wav_path
+
+
+def find_sources(source_dir, label_folders=LABEL_FOLDERS):
+    """Every m4a/mp3/flac file under source_dir's label folders, sorted."""
+    sources = []
+    for label_folder in label_folders:
+        search_dir = os.path.join(source_dir, label_folder)
+        sources.extend(path for _, _, path in scan_audio_files(search_dir, SOURCE_EXTENSIONS))
+    return sorted(sources)
+
+
+def ingest(source_dir, output_dir, manifest_path=MANIFEST_PATH, sample_rate=DEFAULT_SAMPLE_RATE,
+           workers=None, decoder=DECODER, force=False, progress=True):
+    """Convert every source recording to a mono PCM WAV under output_dir and write the manifest.
+
+    Files whose WAV is already up to date are skipped (all of them with
+    force=True are converted again). The manifest is an audio index of
+    output_dir that AudioIndex.load() reads directly, so extraction needs
+    no directory walk. Its 'sources' field holds {source path: {'wav',
+    'status', 'error', 'seconds'}} with status 'converted', 'up_to_date',
+    'failed' or 'duplicate' (another source already maps to that WAV).
+    Returns (AudioIndex, sources).
+    """
+    if os.path.abspath(source_dir) == os.path.abspath(output_dir):
+        raise ValueError("Source and output directories must differ")
+    if shutil.which(decoder) is None:
+        raise RuntimeError(f"Decoder {decoder!r} not found; install ffmpeg or pass --decoder")
+
+    records = {}
+    pending = []
+    wav_paths = set()
+    for source_path in find_sources(source_dir):
+        wav_path = output_path(source_path, source_dir, output_dir)
+        if wav_path in wav_paths:
+            records[source_path] = {'wav': wav_path, 'status': 'duplicate',
+                                    'error': None, 'seconds': None}
+            continue
+        wav_paths.add(wav_path)
+        if not force and is_up_to_date(source_path, wav_path, sample_rate):
+            records[source_path] = {'wav': wav_path, 'status': 'up_to_date',
+                                    'error': None, 'seconds': None}
+        else:
+            pending.append(source_path)
+
+    transcode = Transcoder(source_dir, output_dir, sample_rate, decoder)
+    progress_bar = Progress(len(pending), enabled=progress)
+    outcomes = run_batch(transcode, pending, workers, progress=progress_bar)
+    progress_bar.close()
+    for source_path, (result, error, seconds) in zip(pending, outcomes):
+        records[source_path] = {'wav': output_path(source_path, source_dir, output_dir),
+                                'status': 'failed' if error else 'converted',
+                                'error': error, 'seconds': seconds}
+    records = dict(sorted(records.items()))
+
+    index = AudioIndex.from_paths(output_dir, [record['wav'] for record in records.values()
+                                               if record['status'] in ('converted', 'up_to_date')])
+    index.save(manifest_path, sources=records, source_dir=source_dir, sample_rate=sample_rate)
+    return index, records
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert m4a/mp3/flac recordings to mono PCM WAV files for feature extraction.")
+    parser.add_argument('--source', default=SOURCE_BASE,
+                        help=f"Folder with '0'/'1' label folders of source recordings (default: {SOURCE_BASE})")
+    parser.add_argument('--output', default=OUTPUT_BASE,
+                        help=f"Folder the WAV files are written to, mirroring --source (default: {OUTPUT_BASE})")
+    parser.add_argument('--manifest', default=MANIFEST_PATH,
+                        help=f"Ingest manifest / audio index to write (default: {MANIFEST_PATH})")
+    parser.add_argument('--sample-rate', type=int, default=DEFAULT_SAMPLE_RATE,
+                        help=f"Output sample rate in Hz (default: {DEFAULT_SAMPLE_RATE})")
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help="Number of files converted at once (default: all CPU cores)")
+    parser.add_argument('--decoder', default=DECODER,
+                        help=f"Decoder binary (default: {DECODER})")
+    parser.add_argument('--force', action='store_true',
+                        help="Convert every file again, even if its WAV is up to date")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="No progress display")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        index, records = ingest(args.source, args.output, args.manifest, args.sample_rate,
+                                args.workers, args.decoder, args.force, progress=not args.quiet)
+    except (ValueError, RuntimeError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    counts = {}
+    for record in records.values():
+        counts[record['status']] = counts.get(record['status'], 0) + 1
+
+    print(f"\n📥 Ingest Summary:")
+    print(f"   Source files: {sum(counts.values())}")
+    for status in ('converted', 'up_to_date', 'failed', 'duplicate'):
+        print(f"   {status.replace('_', ' ').capitalize()}: {counts.get(status, 0)}")
+    print(f"   IDs indexed: {len(index)}")
+    print(f"   Time: {time.perf_counter() - start:.1f} s")
+    for source_path, record in records.items():
+        if record['status'] == 'failed':
+            print(f"   ❌ {source_path}: {record['error']}")
+    print(f"\n📝 Manifest saved to {args.manifest}; extract with --audio-index {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
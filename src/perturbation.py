@@ -0,0 +1,172 @@
+import numpy as np
+from parselmouth.praat import call
+
+
+# Praat's standard voice-report settings
+PERIOD_FLOOR = 0.0001  # seconds
+PERIOD_CEILING = 0.02  # seconds, i.e. 50 Hz
+MAX_PERIOD_FACTOR = 1.3  # largest ratio of consecutive periods
+MAX_AMPLITUDE_FACTOR = 1.6  # largest ratio of consecutive amplitudes
+PULSE_BLOCK = 4096  # pulses whose amplitude windows are gathered at once
+
+JITTER_MEASURES = ['local', 'rap', 'ppq5', 'ddp']
+SHIMMER_MEASURES = ['local', 'local_db', 'apq3', 'apq5', 'apq11']
+
+
+def pulse_times(point_process):
+    """Times (s) of every point of a Praat PointProcess, read in one call."""
+    if call(point_process, "Get number of points") == 0:
+        return np.empty(0)
+    return np.asarray(call(point_process, "To Matrix").values[0], dtype=float)
+
+
+def _ratio(a, b):
+    """max(a, b) / min(a, b) elementwise."""
+    return np.maximum(a, b) / np.minimum(a, b)
+
+
+def _windows(values, width):
+    """(len(values) - width + 1, width) view of consecutive runs of `width` values."""
+    if len(values) < width:
+        return np.empty((0, width))
+    return np.lib.stride_tricks.sliding_window_view(values, width)
+
+
+def _valid_runs(in_range, factor_ok, n_periods):
+    """Mask of runs of n_periods consecutive periods that are all in range with every ratio allowed."""
+    ok = _windows(in_range, n_periods).all(axis=1)
+    if n_periods > 1:
+        ok &= _windows(factor_ok, n_periods - 1).all(axis=1)
+    return ok
+
+
+def mean_period(periods, floor=PERIOD_FLOOR, ceiling=PERIOD_CEILING,
+                max_period_factor=MAX_PERIOD_FACTOR):
+    """Praat's mean period: periods in range, dropped only if both neighbours differ by more than the factor."""
+    periods = np.asarray(periods, dtype=float)
+    if len(periods) == 0:
+        return None
+    valid = (periods >= floor) & (periods <= ceiling)
+    previous_factor = np.full(len(periods), np.nan)
+    next_factor = np.full(len(periods), np.nan)
+    previous_factor[1:] = _ratio(periods[1:], periods[:-1])
+    next_factor[:-1] = previous_factor[1:]
+    # NaN (no neighbour) never exceeds the factor
+    valid &= ~((previous_factor > max_period_factor) & (next_factor > max_period_factor))
+    return float(periods[valid].mean()) if valid.any() else None
+
+
+def jitter_from_pulses(times, floor=PERIOD_FLOOR, ceiling=PERIOD_CEILING,
+                       max_period_factor=MAX_PERIOD_FACTOR):
+    """{'local', 'rap', 'ppq5', 'ddp'} jitter of glottal pulse times, as Praat computes them.
+
+    Each measure averages over the runs of 2, 3 or 5 consecutive periods
+    that all lie in [floor, ceiling] with no consecutive ratio above
+    max_period_factor, and is divided by the mean period. Measures with
+    too few runs are None.
+    """
+    periods = np.diff(np.asarray(times, dtype=float))
+    jitter = {measure: None for measure in JITTER_MEASURES}
+    average = mean_period(periods, floor, ceiling, max_period_factor)
+    if average is None or len(periods) < 2:
+        return jitter
+    in_range = (periods >= floor) & (periods <= ceiling)
+    factor_ok = _ratio(periods[1:], periods[:-1]) <= max_period_factor
+
+    ok = _valid_runs(in_range, factor_ok, 2)
+    if ok.any():
+        jitter['local'] = float(np.abs(np.diff(periods))[ok].mean() / average)
+
+    ok = _valid_runs(in_range, factor_ok, 3)
+    if ok.any():
+        runs = _windows(periods, 3)[ok]
+        jitter['rap'] = float(np.abs(runs[:, 1] - runs.mean(axis=1)).mean() / average)
+        jitter['ddp'] = float(np.abs(runs[:, 2] - 2 * runs[:, 1] + runs[:, 0]).mean() / average)
+
+    ok = _valid_runs(in_range, factor_ok, 5)
+    if ok.any():
+        runs = _windows(periods, 5)[ok]
+        jitter['ppq5'] = float(np.abs(runs[:, 2] - runs.mean(axis=1)).mean() / average)
+    return jitter
+
+
+def pulse_amplitudes(samples, sampling_frequency, times, start_time=0.0, floor=PERIOD_FLOOR,
+                     ceiling=PERIOD_CEILING, max_period_factor=MAX_PERIOD_FACTOR,
+                     block_size=PULSE_BLOCK):
+    """(times, amplitudes) of the pulses Praat measures shimmer at.
+
+    A pulse counts when the periods on both sides are in range and within
+    max_period_factor of each other. Its amplitude is the RMS under a Hann
+    window spanning 0.2 of the previous period before it and 0.2 of the
+    next period after it. samples is the mono signal and start_time the
+    time of its first sample. Windows are gathered block_size pulses at a
+    time, so memory stays bounded on long recordings.
+    """
+    samples = np.asarray(samples, dtype=float)
+    times = np.asarray(times, dtype=float)
+    if len(times) < 3 or len(samples) == 0:
+        return np.empty(0), np.empty(0)
+    before = times[1:-1] - times[:-2]
+    after = times[2:] - times[1:-1]
+    keep = ((before >= floor) & (before <= ceiling) & (after >= floor) & (after <= ceiling) &
+            (_ratio(before, after) <= max_period_factor))
+    centres, before, after = times[1:-1][keep], 0.2 * before[keep], 0.2 * after[keep]
+
+    # Samples whose times fall inside [centre - before, centre + after]
+    dt = 1 / sampling_frequency
+    first = np.maximum(np.ceil((centres - before - start_time) / dt - 1e-9).astype(int), 0)
+    last = np.minimum(np.floor((centres + after - start_time) / dt + 1e-9).astype(int),
+                      len(samples) - 1)
+    amplitudes = np.full(len(centres), np.nan)
+    for start in range(0, len(centres), block_size):
+        stop = start + block_size
+        block_first, block_last = first[start:stop], last[start:stop]
+        if len(block_first) == 0:
+            continue
+        width = max(1, int((block_last - block_first).max()) + 1)
+        index = block_first[:, None] + np.arange(width)
+        inside = index <= block_last[:, None]
+        index = np.minimum(index, len(samples) - 1)
+        offset = start_time + index * dt - centres[start:stop, None]
+        half_width = np.where(offset < 0, before[start:stop, None], after[start:stop, None])
+        window = np.where(inside, 0.5 + 0.5 * np.cos(np.pi * offset / half_width), 0.0)
+        sum_squares = np.sum((samples[index] * window) ** 2, axis=1)
+        window_squares = np.sum(window ** 2, axis=1)
+        enough = inside.sum(axis=1) >= 3
+        amplitudes[start:stop][enough] = np.sqrt(sum_squares[enough] / window_squares[enough])
+    measured = np.isfinite(amplitudes) & (amplitudes > 0)
+    return centres[measured], amplitudes[measured]
+
+
+def shimmer_from_pulses(times, amplitudes, floor=PERIOD_FLOOR, ceiling=PERIOD_CEILING,
+                        max_amplitude_factor=MAX_AMPLITUDE_FACTOR):
+    """{'local', 'local_db', 'apq3', 'apq5', 'apq11'} shimmer of per-pulse amplitudes, as Praat computes them.
+
+    Each measure averages over runs of 2, 3, 5 or 11 consecutive amplitudes
+    whose time gaps lie in [floor, ceiling] and whose consecutive ratios
+    are at most max_amplitude_factor. All but local_db (in dB) are divided
+    by the mean amplitude. Measures with too few runs are None.
+    """
+    times = np.asarray(times, dtype=float)
+    amplitudes = np.asarray(amplitudes, dtype=float)
+    shimmer = {measure: None for measure in SHIMMER_MEASURES}
+    if len(amplitudes) < 2:
+        return shimmer
+    gaps = np.diff(times)
+    in_range = (gaps >= floor) & (gaps <= ceiling)
+    ratios = _ratio(amplitudes[1:], amplitudes[:-1])
+    factor_ok = ratios <= max_amplitude_factor
+    average = amplitudes[:-1].mean()
+
+    ok = in_range & factor_ok
+    if ok.any():
+        shimmer['local'] = float(np.abs(np.diff(amplitudes))[ok].mean() / average)
+        shimmer['local_db'] = float(np.abs(20 * np.log10(ratios[ok])).mean())
+
+    for measure, n_points in (('apq3', 3), ('apq5', 5), ('apq11', 11)):
+        ok = _windows(in_range, n_points - 1).all(axis=1) & _windows(factor_ok, n_points - 1).all(axis=1)
+        if ok.any():
+            runs = _windows(amplitudes, n_points)[ok]
+            centre = runs[:, n_points // 2]
+            shimmer[measure] = float(np.abs(centre - runs.mean(axis=1)).mean() / average)
+    return shimmer
@@ -0,0 +1,110 @@
+import numpy as np
+
+
+PITCH_METHODS = ('ac', 'cc', 'shs')
+
+# Search ranges per speaker group (Hz); 'default' is Praat's own 75-600 Hz.
+# The analysis window spans 3 periods of the floor, so a higher floor is what
+# makes tracking cheaper; a lower ceiling mainly prevents octave jumps.
+PITCH_PRESETS = {
+    'default': {'floor': 75.0, 'ceiling': 600.0},
+    'male': {'floor': 75.0, 'ceiling': 300.0},
+    'female': {'floor': 100.0, 'ceiling': 500.0},
+    'child': {'floor': 150.0, 'ceiling': 700.0},
+}
+
+# Two-pass range estimation (De Looze & Hirst): floor = 0.75 * q15, ceiling = 1.5 * q65
+TWO_PASS_TIME_STEP = 0.02
+TWO_PASS_FLOOR_FACTOR = 0.75
+TWO_PASS_CEILING_FACTOR = 1.5
+TWO_PASS_MIN_VOICED = 10
+
+
+class PitchConfig:
+    """Pitch analysis settings shared by every pitch-based extractor.
+
+    time_step=None lets Praat choose (0.75 / floor). With two_pass=True a
+    coarse first pass over [floor, ceiling] estimates the speaker's range,
+    and the real track is computed over that narrower range. trim, a
+    TrimConfig, crops leading and trailing silence before any Praat
+    analysis; it is part of params() only when set, so untrimmed keys are
+    unchanged.
+    """
+
+    def __init__(self, time_step=None, floor=75.0, ceiling=600.0, method='ac', two_pass=False,
+                 trim=None):
+        if method not in PITCH_METHODS:
+            raise ValueError(f"Unknown pitch method {method!r}; expected one of {PITCH_METHODS}")
+        if not 0 < floor < ceiling:
+            raise ValueError(f"Pitch floor ({floor}) must be positive and below the ceiling ({ceiling})")
+        self.time_step = time_step
+        self.floor = float(floor)
+        self.ceiling = float(ceiling)
+        self.method = method
+        self.two_pass = two_pass
+        self.trim = trim
+
+    @classmethod
+    def preset(cls, name, **overrides):
+        """Config from a PITCH_PRESETS entry, with any setting overridden."""
+        if name not in PITCH_PRESETS:
+            raise ValueError(f"Unknown pitch preset {name!r}; expected one of {list(PITCH_PRESETS)}")
+        return cls(**{**PITCH_PRESETS[name], **overrides})
+
+    def params(self):
+        """JSON-serializable settings, used in cache and pitch-store keys."""
+        params = {'time_step': self.time_step, 'floor': self.floor, 'ceiling': self.ceiling,
+                  'method': self.method, 'two_pass': self.two_pass}
+        if self.trim is not None:
+            params['trim'] = self.trim.params()
+        return params
+
+    def __repr__(self):
+        settings = ', '.join(f"{name}={value!r}" for name, value in self.params().items())
+        return f"PitchConfig({settings})"
+
+    def _track(self, sound, time_step, floor, ceiling):
+        if self.method == 'cc':
+            return sound.to_pitch_cc(time_step=time_step, pitch_floor=floor, pitch_ceiling=ceiling)
+        if self.method == 'shs':
+            return sound.to_pitch_shs(time_step=time_step or 0.75 / floor,
+                                      minimum_pitch=floor, ceiling=ceiling)
+        return sound.to_pitch_ac(time_step=time_step, pitch_floor=floor, pitch_ceiling=ceiling)
+
+    def speaker_range(self, sound):
+        """(floor, ceiling) estimated from a coarse first pass, or the configured range if too little is voiced."""
+        pitch = self._track(sound, max(self.time_step or 0, TWO_PASS_TIME_STEP),
+                            self.floor, self.ceiling)
+        pitch_values = pitch.selected_array['frequency']
+        pitch_values = pitch_values[pitch_values > 0]
+        if len(pitch_values) < TWO_PASS_MIN_VOICED:
+            return self.floor, self.ceiling
+        q15, q65 = np.percentile(pitch_values, [15, 65])
+        floor = max(self.floor, TWO_PASS_FLOOR_FACTOR * q15)
+        ceiling = min(self.ceiling, TWO_PASS_CEILING_FACTOR * q65)
+        if ceiling <= floor:
+            return self.floor, self.ceiling
+        return floor, ceiling
+
+    def to_pitch(self, sound, time_step=None):
+        """Pitch-track a Sound with these settings; time_step overrides the configured one."""
+        time_step = time_step or self.time_step
+        floor, ceiling = self.speaker_range(sound) if self.two_pass else (self.floor, self.ceiling)
+        return self._track(sound, time_step, floor, ceiling)
+
+
+def to_pitch(sound, pitch_config=None, time_step=None):
+    """sound.to_pitch() with a PitchConfig (default: Praat's standard settings)."""
+    return (pitch_config or PitchConfig()).to_pitch(sound, time_step)
+
+
+class PitchConfigExtractor:
+    """Picklable wrapper that calls extract(audio_path, pitch_config=pitch_config)."""
+
+    def __init__(self, extract, pitch_config):
+        self.extract = extract
+        self.pitch_config = pitch_config
+        self.__name__ = extract.__name__
+
+    def __call__(self, audio_path):
+        return self.extract(audio_path, pitch_config=self.pitch_config)
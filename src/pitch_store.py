@@ -0,0 +1,141 @@
+import os
+import json
+import hashlib
+import numpy as np
+import parselmouth
+from pitch_config import PitchConfig
+from stage_timer import stage, count
+from prescreen import PrescreenRejected, prescreen
+from trim import trim_sound
+
+
+PITCH_STORE_VERSION = 1
+
+
+class PitchTrack:
+    """Frame-level pitch contour with its timing, usable wherever a Praat Pitch is read.
+
+    Exposes selected_array['frequency'], x1, dx and nx like parselmouth.Pitch,
+    so the *_from_pitch helpers in utils.py accept it unchanged. Unvoiced
+    frames are 0 Hz.
+    """
+
+    def __init__(self, frequency, x1, dx):
+        self.frequency = frequency
+        self.x1 = float(x1)
+        self.dx = float(dx)
+
+    @classmethod
+    def from_pitch(cls, pitch):
+        """Compact float32 copy of a parselmouth.Pitch."""
+        return cls(pitch.selected_array['frequency'].astype(np.float32), pitch.x1, pitch.dx)
+
+    @property
+    def selected_array(self):
+        return {'frequency': self.frequency}
+
+    @property
+    def nx(self):
+        return len(self.frequency)
+
+    def xs(self):
+        """Frame centre times in seconds."""
+        return self.x1 + np.arange(self.nx) * self.dx
+
+
+class PitchStore:
+    """Directory of per-file pitch tracks: <key>.npy (float32 Hz) plus <key>.json (timing, params).
+
+    Keys combine the file's path, size and mtime with the PitchConfig settings,
+    so an edited recording or a different pitch setting gets a new track.
+    Tracks are loaded memory-mapped.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+
+    def key(self, audio_path, pitch_config=None):
+        stat = os.stat(audio_path)
+        params = (pitch_config or PitchConfig()).params()
+        raw = json.dumps([PITCH_STORE_VERSION, os.path.abspath(audio_path), stat.st_size,
+                          stat.st_mtime_ns, params], sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.store_dir, key)
+        return base + '.npy', base + '.json'
+
+    def load(self, audio_path, pitch_config=None):
+        """Stored PitchTrack for audio_path, or None if it has not been computed yet."""
+        array_path, meta_path = self._paths(self.key(audio_path, pitch_config))
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return PitchTrack(np.load(array_path, mmap_mode='r'), meta['x1'], meta['dx'])
+
+    def save(self, audio_path, track, pitch_config=None):
+        """Write a track; the metadata file is written last and marks it complete.
+
+        Both files are written under a per-process temporary name and moved
+        into place, so a script that has the track memory-mapped never sees
+        another script rewrite it.
+        """
+        pitch_config = pitch_config or PitchConfig()
+        array_path, meta_path = self._paths(self.key(audio_path, pitch_config))
+        tmp_path = f"{array_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.asarray(track.frequency, dtype=np.float32))
+        os.replace(tmp_path, array_path)
+        tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'audio_path': audio_path, 'x1': track.x1, 'dx': track.dx,
+                       'nx': track.nx, 'params': pitch_config.params()}, f)
+        os.replace(tmp_path, meta_path)
+
+    def get_or_compute(self, audio_path, pitch_config=None):
+        """Load the stored track, or pitch-track the file once and store the result.
+
+        Raises PrescreenRejected instead of tracking a too-short or silent file.
+        """
+        pitch_config = pitch_config or PitchConfig()
+        with stage('load'):
+            track = self.load(audio_path, pitch_config)
+        if track is None:
+            count('pitch_store_misses')
+            screen = prescreen(audio_path)
+            if screen.rejected:
+                raise PrescreenRejected(screen)
+            with stage('track'):
+                sound = trim_sound(parselmouth.Sound(audio_path), pitch_config.trim)
+                pitch = pitch_config.to_pitch(sound)
+                track = PitchTrack.from_pitch(pitch)
+            with stage('save'):
+                self.save(audio_path, track, pitch_config)
+        else:
+            count('pitch_store_hits')
+        return track
+
+
+class PitchStoreExtractor:
+    """Picklable wrapper that calls extract(audio_path, pitch=<stored track>, pitch_config=...).
+
+    Falls back to extract(audio_path, pitch_config=...) if no track can be
+    produced (including files the prescreen rejects), so the extractor's
+    own error handling and prescreen gate still apply.
+    """
+
+    def __init__(self, extract, store_dir, pitch_config=None):
+        self.extract = extract
+        self.store_dir = store_dir
+        self.pitch_config = pitch_config
+        self.__name__ = f"{extract.__name__}+pitch_store"
+
+    def __call__(self, audio_path):
+        try:
+            with stage('pitch_store'):
+                track = PitchStore(self.store_dir).get_or_compute(audio_path, self.pitch_config)
+        except Exception as e:
+            return self.extract(audio_path, pitch_config=self.pitch_config)
+        return self.extract(audio_path, pitch=track, pitch_config=self.pitch_config)
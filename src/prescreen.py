@@ -0,0 +1,134 @@
+import struct
+import numpy as np
+import soundfile as sf
+from wav_io import read_wav_header, load_wav
+
+
+PRESCREEN_STATUS_KEY = 'prescreen_status'
+MIN_DURATION_SECONDS = 0.25  # shorter files cannot give a stable pitch track
+SILENCE_RMS_DBFS = -60.0  # speech sits around -30 to -15 dBFS
+CLIP_LEVEL = 0.999  # fraction of full scale that counts as clipped
+CLIP_FRACTION = 0.001  # share of clipped samples above which a file is flagged
+REJECTED_STATUSES = ('too_short', 'silent')
+_BLOCK_SAMPLES = 1 << 20
+
+
+class PrescreenRejected(Exception):
+    """Raised instead of running a Praat analysis on a file the prescreen rejected."""
+
+    def __init__(self, result):
+        super().__init__(f"rejected by prescreen: {result.status}")
+        self.result = result
+
+
+class PrescreenResult:
+    """Outcome of the prescreen: status is 'too_short', 'silent', 'clipped' or 'ok'.
+
+    Clipped files are still analysed; only too_short and silent ones are
+    rejected. Levels are in dB relative to full scale and are None when
+    the samples were not read (too_short files).
+    """
+
+    def __init__(self, status, duration, rms_dbfs=None, peak_dbfs=None, clipped_fraction=None):
+        self.status = status
+        self.duration = duration
+        self.rms_dbfs = rms_dbfs
+        self.peak_dbfs = peak_dbfs
+        self.clipped_fraction = clipped_fraction
+
+    @property
+    def rejected(self):
+        return self.status in REJECTED_STATUSES
+
+
+def _dbfs(level):
+    return 20 * np.log10(level) if level > 0 else -np.inf
+
+
+def audio_duration(audio_path):
+    """Duration in seconds from the WAV header, or from soundfile for other formats."""
+    try:
+        return read_wav_header(audio_path).duration
+    except (ValueError, struct.error):
+        return sf.info(audio_path).duration
+
+
+def _screen_blocks(blocks, duration, full_scale):
+    """PrescreenResult from (channels, samples) blocks, accumulated in one pass.
+
+    Integer blocks are measured in their stored type; only one block at a
+    time is squared as float64.
+    """
+    clip_level = CLIP_LEVEL * full_scale
+    sum_squares = 0.0
+    peak = 0.0
+    clipped = 0
+    size = 0
+    for block in blocks:
+        if block.size == 0:
+            continue
+        # max/min in the stored type; -min as a float so -32768 cannot overflow
+        peak = max(peak, float(block.max()), -float(block.min()))
+        clipped += np.count_nonzero((block >= clip_level) | (block <= -clip_level))
+        size += block.size
+        block = block.astype(np.float64).ravel()
+        sum_squares += np.dot(block, block)
+    if size == 0:
+        return PrescreenResult('too_short', duration)
+
+    rms_dbfs = _dbfs(np.sqrt(sum_squares / size) / full_scale)
+    peak_dbfs = _dbfs(peak / full_scale)
+    clipped_fraction = clipped / size
+    if rms_dbfs < SILENCE_RMS_DBFS:
+        status = 'silent'
+    elif clipped_fraction > CLIP_FRACTION:
+        status = 'clipped'
+    else:
+        status = 'ok'
+    return PrescreenResult(status, duration, rms_dbfs, peak_dbfs, clipped_fraction)
+
+
+def screen_samples(samples):
+    """Classify a WavSamples (or Sound-like object) with one blockwise RMS/peak/clipping pass.
+
+    Integer PCM is measured in its stored type, so int16 data is never
+    converted as a whole.
+    """
+    values = samples.values
+    n_samples = values.shape[1]
+    duration = n_samples / samples.sampling_frequency
+    if duration < MIN_DURATION_SECONDS:
+        return PrescreenResult('too_short', duration)
+
+    if np.issubdtype(values.dtype, np.integer):
+        full_scale = float(2 ** (8 * values.dtype.itemsize - 1))
+    else:
+        full_scale = 1.0
+    blocks = (values[:, start:start + _BLOCK_SAMPLES] for start in range(0, n_samples, _BLOCK_SAMPLES))
+    return _screen_blocks(blocks, duration, full_scale)
+
+
+def screen_file_blocks(audio_path, block_samples=_BLOCK_SAMPLES):
+    """Classify a file read with soundfile block by block, so memory stays bounded for any format.
+
+    Used by streaming extraction: formats load_wav cannot memory-map
+    (24-bit or 8-bit PCM, FLAC) would otherwise be read whole.
+    """
+    duration = audio_duration(audio_path)
+    if duration < MIN_DURATION_SECONDS:
+        return PrescreenResult('too_short', duration)
+    blocks = (data.T for data in sf.blocks(audio_path, blocksize=block_samples,
+                                           always_2d=True, dtype='float64'))
+    return _screen_blocks(blocks, duration, 1.0)
+
+
+def prescreen(audio_path):
+    """Classify a file as too_short, silent, clipped or ok before any Praat analysis.
+
+    Too-short files are rejected from the header alone. The others get one
+    pass over the memory-mapped samples.
+    """
+    duration = audio_duration(audio_path)
+    if duration < MIN_DURATION_SECONDS:
+        return PrescreenResult('too_short', duration)
+    return screen_samples(load_wav(audio_path))
@@ -0,0 +1,122 @@
+from audio_analysis import AudioAnalysis, INTERMEDIATES
+from stage_timer import stage
+from prescreen import PRESCREEN_STATUS_KEY
+from trim import TRIM_KEYS, trim_from_region
+from utils import (JITTER_KEYS, SHIMMER_KEYS, F0_KEYS, HNR_KEYS, ZCR_KEYS, VOICE_BREAKS_KEYS,
+                   jitter_from_pitch, shimmer_from_pitch, f0_from_pitch,
+                   hnr_from_harmonicity, zcr_from_sound, voice_breaks_from_pitch)
+
+
+class FeatureFamily:
+    """Output schema and required intermediates of one feature family.
+
+    compute(*intermediates) receives the intermediates in `requires` order
+    and returns {key: value} for every key in `keys`.
+    """
+
+    def __init__(self, name, keys, requires, compute):
+        self.name = name
+        self.keys = list(keys)
+        self.requires = tuple(requires)
+        self.compute = compute
+
+
+FEATURE_FAMILIES = {}
+
+
+def register_family(name, keys, requires, compute):
+    """Register a feature family; families are extracted and written in registration order."""
+    unknown = [dependency for dependency in requires if dependency not in INTERMEDIATES]
+    if unknown:
+        raise ValueError(f"Feature family {name!r} requires unregistered {unknown}")
+    FEATURE_FAMILIES[name] = FeatureFamily(name, keys, requires, compute)
+    return FEATURE_FAMILIES[name]
+
+
+register_family('jitter', JITTER_KEYS, ('pitch', 'pulses'), jitter_from_pitch)
+register_family('shimmer', SHIMMER_KEYS, ('sound', 'pitch', 'pulses'), shimmer_from_pitch)
+register_family('f0', F0_KEYS, ('pitch',), f0_from_pitch)
+register_family('hnr', HNR_KEYS, ('harmonicity',), hnr_from_harmonicity)
+register_family('zcr', ZCR_KEYS, ('samples',), zcr_from_sound)
+register_family('voice_breaks', VOICE_BREAKS_KEYS, ('pitch', 'active_region'), voice_breaks_from_pitch)
+register_family('trim', TRIM_KEYS, ('active_region',), trim_from_region)
+
+
+# Intermediates that need a parselmouth.Pitch rather than just its contour
+PRAAT_PITCH_INTERMEDIATES = {'point_process'}
+
+
+def resolve_families(names=None):
+    """FeatureFamily objects for the given names (default: all), in registration order."""
+    if names is None:
+        return list(FEATURE_FAMILIES.values())
+    unknown = [name for name in names if name not in FEATURE_FAMILIES]
+    if unknown:
+        raise ValueError(f"Unknown feature families {unknown}; expected some of {list(FEATURE_FAMILIES)}")
+    return [family for name, family in FEATURE_FAMILIES.items() if name in names]
+
+
+def required_intermediates(names=None):
+    """Every intermediate the given families need, including indirect requirements."""
+    required = set()
+    pending = [name for family in resolve_families(names) for name in family.requires]
+    while pending:
+        name = pending.pop()
+        if name not in required:
+            required.add(name)
+            pending.extend(INTERMEDIATES[name].requires)
+    return required
+
+
+def contour_only(names=None):
+    """Whether the families read the pitch only as a contour, so a stored PitchTrack can stand in for it.
+
+    Glottal pulses (point_process and what is built from it) need Praat's
+    own Pitch object.
+    """
+    needs = required_intermediates(names)
+    return 'pitch' in needs and not needs & PRAAT_PITCH_INTERMEDIATES
+
+
+def extract_features(audio_path, families=None, pitch=None, pitch_config=None):
+    """Extract the requested feature families, building each intermediate at most once.
+
+    audio_path may also be an AudioAnalysis shared with other extractors.
+    Only the intermediates the families need are built, so a precomputed
+    pitch (e.g. a stored PitchTrack) skips decoding the file unless a
+    family needs the Sound itself. A family that fails, or whose
+    intermediates fail to build, gets None for all of its keys.
+
+    The prescreen runs first and its status is returned under
+    PRESCREEN_STATUS_KEY. Files it rejects (too short or silent) get None
+    for every key without any Praat analysis.
+    """
+    analysis = AudioAnalysis.of(audio_path, pitch, pitch_config)
+    try:
+        screen = analysis.prescreen if analysis.gate else None
+    except Exception as e:
+        screen = None
+    features = {}
+    for family in resolve_families(families):
+        if screen is not None and screen.rejected:
+            features.update({key: None for key in family.keys})
+            continue
+        try:
+            requires = [analysis.get(name) for name in family.requires]
+            with stage(f"family.{family.name}"):
+                features.update(family.compute(*requires))
+        except Exception as e:
+            features.update({key: None for key in family.keys})
+    features[PRESCREEN_STATUS_KEY] = screen.status if screen is not None else None
+    return features
+
+
+class FamilyExtractor:
+    """Picklable extract_features bound to a set of families, for run_batch and the cache."""
+
+    def __init__(self, families=None):
+        self.families = [family.name for family in resolve_families(families)]
+        self.__name__ = f"extract_features[{','.join(self.families)}]"
+
+    def __call__(self, audio_path, pitch=None, pitch_config=None):
+        return extract_features(audio_path, self.families, pitch, pitch_config)
@@ -0,0 +1,124 @@
+import os
+import sys
+import json
+import time
+from feature_cache import json_default
+
+
+QUIET = 0
+NORMAL = 1
+VERBOSE = 2
+LOG_BUFFER_BYTES = 1024 * 1024
+PROGRESS_INTERVAL = 0.5  # seconds between redraws on a terminal
+PROGRESS_INTERVAL_PIPE = 30.0  # seconds between progress lines when output is redirected
+
+
+def _format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class Progress:
+    """Files done, rate and ETA on one line, redrawn at most every PROGRESS_INTERVAL seconds.
+
+    Pass the instance as run_batch's progress callback. When the stream is
+    not a terminal, a plain line is printed every PROGRESS_INTERVAL_PIPE
+    seconds instead.
+    """
+
+    def __init__(self, total, stream=None, enabled=True):
+        self.total = total
+        self.done = 0
+        self.errors = 0
+        self.stream = stream or sys.stderr
+        self.enabled = enabled and total > 0
+        self.tty = self.stream.isatty()
+        self.interval = PROGRESS_INTERVAL if self.tty else PROGRESS_INTERVAL_PIPE
+        self.start = time.perf_counter()
+        self._last_draw = self.start
+
+    def __call__(self, outcomes):
+        for outcome in outcomes:
+            self.done += 1
+            self.errors += outcome[1] is not None
+        now = time.perf_counter()
+        if self.enabled and now - self._last_draw >= self.interval:
+            self._draw(now)
+
+    def _draw(self, now, final=False):
+        self._last_draw = now
+        elapsed = max(now - self.start, 1e-9)
+        rate = self.done / elapsed
+        eta = _format_seconds((self.total - self.done) / rate) if rate else '?'
+        line = (f"{self.done}/{self.total} files ({self.done / self.total * 100:.1f}%)  "
+                f"{rate:.1f} files/s  elapsed {_format_seconds(elapsed)}  ETA {eta}  "
+                f"errors {self.errors}")
+        if self.tty:
+            self.stream.write('\r' + line + ('\n' if final else ''))
+        else:
+            self.stream.write(line + '\n')
+        self.stream.flush()
+
+    def close(self):
+        """Draw the final state."""
+        if self.enabled:
+            self._draw(time.perf_counter(), final=True)
+
+
+class RunLog:
+    """Buffered JSONL event log of one extraction run.
+
+    Holds a run_start event, one 'file' record per input ID (status,
+    failure reason, extraction seconds, feature count) and a run_end event
+    with the status counts. Records go through a large write buffer rather
+    than to the terminal. info() prints console messages at or below the
+    configured verbosity (QUIET, NORMAL or VERBOSE).
+    """
+
+    def __init__(self, log_path, verbosity=NORMAL):
+        log_dir = os.path.dirname(log_path)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        self.log_path = log_path
+        self.verbosity = verbosity
+        self.counts = {}
+        self.start = time.perf_counter()
+        self._file = open(log_path, 'w', buffering=LOG_BUFFER_BYTES)
+
+    def info(self, message, level=NORMAL):
+        if self.verbosity >= level:
+            print(message)
+
+    def event(self, event, **fields):
+        self._file.write(json.dumps({'event': event, 'time': round(time.time(), 3), **fields},
+                                    default=json_default) + '\n')
+
+    def file(self, audio_id, status, audio_path=None, reason=None, seconds=None,
+             n_features=0, families=()):
+        """Record the outcome of one input ID.
+
+        status is 'ok', 'failed', 'not_found' or a prescreen rejection
+        ('too_short', 'silent').
+        """
+        self.counts[status] = self.counts.get(status, 0) + 1
+        self.event('file', audio_id=audio_id, audio_path=audio_path, status=status,
+                   reason=reason, seconds=None if seconds is None else round(seconds, 4),
+                   n_features=n_features, families=list(families))
+        if status == 'ok':
+            self.info(f"✅ {audio_id}: {n_features} features ({', '.join(families)})", VERBOSE)
+        else:
+            self.info(f"❌ {audio_id}: {reason}", VERBOSE)
+
+    def close(self, **fields):
+        """Write the run_end event with the status counts and flush the log."""
+        self.event('run_end', counts=self.counts,
+                   seconds=round(time.perf_counter() - self.start, 3), **fields)
+        self._file.close()
+
+
+def load_run_log(log_path, event='file'):
+    """Every record of the given event type in a run log."""
+    with open(log_path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [record for record in records if record['event'] == event]
@@ -0,0 +1,137 @@
+import os
+import json
+from feature_cache import CACHE_VERSION, json_default, run_cached_batch
+
+
+DEFAULT_FLUSH_EVERY = 256
+
+
+def file_state(audio_path, cache=None):
+    """(size, mtime_ns, digest) of a file; digest is the feature cache fingerprint, None without a cache."""
+    stat = os.stat(audio_path)
+    digest = cache.fingerprint(audio_path) if cache is not None else None
+    return stat.st_size, stat.st_mtime_ns, digest
+
+
+class RunManifest:
+    """Append-only JSONL checkpoint of the files a script has finished.
+
+    Each line records one audio path, the extractor that processed it, the
+    file's size, mtime and content digest when it was read, and its
+    (result, error, seconds) outcome. Lines are flushed and fsynced batch
+    by batch, so an interrupted run loses at most the batch in flight. A
+    torn last line is dropped on load. A later line for the same file
+    replaces the earlier one.
+    """
+
+    def __init__(self, manifest_path, restart=False):
+        self.manifest_path = manifest_path
+        self.outcomes = {}
+        self.states = {}
+        manifest_dir = os.path.dirname(manifest_path)
+        if manifest_dir:
+            os.makedirs(manifest_dir, exist_ok=True)
+        if restart and os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        elif os.path.exists(manifest_path):
+            self._load()
+
+    def _load(self):
+        """Read every complete record and cut off a line torn by an interrupted write."""
+        valid_bytes = 0
+        with open(self.manifest_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                key = (record['extractor'], record['audio_path'])
+                self.outcomes[key] = (record['result'], record['error'], record.get('seconds'))
+                self.states[key] = (record.get('size'), record.get('mtime_ns'), record.get('digest'))
+                valid_bytes += len(line)
+        if valid_bytes < os.path.getsize(self.manifest_path):
+            os.truncate(self.manifest_path, valid_bytes)
+
+    def done(self, extractor, audio_path, cache=None):
+        """Whether the file has an error-free outcome recorded for its current contents.
+
+        Unchanged size and mtime are enough; otherwise the file counts as
+        done only if its cache fingerprint still matches. Outcomes with an
+        error (including crashed workers) are never done, so they are retried.
+        """
+        key = (extractor, audio_path)
+        if key not in self.outcomes or self.outcomes[key][1] is not None:
+            return False
+        size, mtime_ns, digest = self.states[key]
+        try:
+            stat = os.stat(audio_path)
+        except OSError:
+            return False
+        if (stat.st_size, stat.st_mtime_ns) == (size, mtime_ns):
+            return True
+        return cache is not None and digest is not None and cache.fingerprint(audio_path) == digest
+
+    def record(self, extractor, audio_paths, outcomes, states):
+        """Append a batch of finished files with the (size, mtime_ns, digest) they were read at and force it to disk."""
+        with open(self.manifest_path, 'a') as f:
+            for audio_path, (result, error, seconds), (size, mtime_ns, digest) in zip(
+                    audio_paths, outcomes, states):
+                f.write(json.dumps({'extractor': extractor, 'audio_path': audio_path,
+                                    'size': size, 'mtime_ns': mtime_ns, 'digest': digest,
+                                    'result': result, 'error': error, 'seconds': seconds},
+                                   default=json_default) + '\n')
+                self.outcomes[(extractor, audio_path)] = (result, error, seconds)
+                self.states[(extractor, audio_path)] = (size, mtime_ns, digest)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def finalize(self):
+        """Remove the checkpoint once a run has completed; later runs reuse results via the feature cache."""
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+        self.outcomes = {}
+        self.states = {}
+
+
+def run_resumable(manifest, extract, audio_paths, flush_every=DEFAULT_FLUSH_EVERY, log=None,
+                  **batch_kwargs):
+    """{audio_path: (result, error, seconds)} for every path, skipping files the manifest already has.
+
+    Pending files (new, changed since they were recorded, or failed) are
+    extracted flush_every at a time (through the feature cache and process
+    pool) and checkpointed after each batch. Results are recorded per
+    extractor, cache params and CACHE_VERSION, so changing any of them
+    starts afresh. log is
+    the RunLog that resume messages go to.
+    """
+    extractor = f"{extract.__name__}@{CACHE_VERSION}"
+    if batch_kwargs.get('params'):
+        extractor += '|' + json.dumps(batch_kwargs['params'], sort_keys=True, default=json_default)
+    cache = batch_kwargs.get('cache')
+    audio_paths = list(dict.fromkeys(audio_paths))
+    done = [audio_path for audio_path in audio_paths if manifest.done(extractor, audio_path, cache)]
+    done_set = set(done)
+    pending = [audio_path for audio_path in audio_paths if audio_path not in done_set]
+    if done:
+        retried = sum((extractor, audio_path) in manifest.outcomes for audio_path in pending)
+        if log is not None:
+            log.info(f"Resuming: {len(done)} files already done, {len(pending)} to process "
+                     f"({retried} failed or changed since last run)")
+            log.event('resume', done=len(done), pending=len(pending), retried=retried)
+        if batch_kwargs.get('progress'):
+            batch_kwargs['progress']([manifest.outcomes[(extractor, audio_path)] for audio_path in done])
+
+    for start in range(0, len(pending), max(1, flush_every)):
+        batch = pending[start:start + flush_every]
+        states = []
+        for audio_path in batch:
+            # Taken before extraction, so an edit during the run is seen as a change next time
+            try:
+                states.append(file_state(audio_path, cache))
+            except OSError:
+                states.append((None, None, None))
+        manifest.record(extractor, batch, run_cached_batch(extract, batch, **batch_kwargs), states)
+
+    return {audio_path: manifest.outcomes[(extractor, audio_path)] for audio_path in audio_paths}
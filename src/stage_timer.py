@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import zlib
+import cProfile
+import numpy as np
+from feature_cache import json_default
+
+
+# StageTimer of the file this process is extracting, or None when tracing is off
+_active = None
+
+
+class StageTimer:
+    """Wall-clock seconds per named stage plus integer counters for one unit of work.
+
+    Stages opened inside another stage are recorded as 'outer/inner', so
+    the top-level stages never overlap and add up to at most the total.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self._open = []
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def record(self):
+        return {'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+                'counters': dict(self.counters)}
+
+
+class _Stage:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.path = '/'.join(self.timer._open + [self.name])
+        self.timer._open.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.path, time.perf_counter() - self.start)
+        self.timer._open.pop()
+        return False
+
+
+class _NoStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name):
+    """Context manager timing a block as stage `name` while tracing; a no-op otherwise."""
+    if _active is None:
+        return _NO_STAGE
+    return _active.stage(name)
+
+
+def count(name, n=1):
+    """Add n to counter `name` while tracing."""
+    if _active is not None:
+        _active.count(name, n)
+
+
+def append_trace(trace_path, record):
+    """Append one record to a JSONL trace; single small writes keep lines intact across workers."""
+    with open(trace_path, 'a') as f:
+        f.write(json.dumps(record, default=json_default) + '\n')
+
+
+def load_trace(trace_path):
+    """Every complete record of a JSONL trace."""
+    records = []
+    if not os.path.exists(trace_path):
+        return records
+    with open(trace_path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def profile_sampled(audio_path, profile_every):
+    """Deterministic 1-in-profile_every choice of files, independent of how work is scheduled."""
+    return profile_every > 0 and zlib.crc32(audio_path.encode()) % profile_every == 0
+
+
+class TracedExtractor:
+    """Picklable wrapper that times every call's stages into a JSONL trace.
+
+    Each call appends {'audio_path', 'pid', 'total', 'stages', 'counters',
+    'error', 'profile'} to trace_path. With profile_dir set, one file in
+    every profile_every is also run under cProfile and its stats written
+    to profile_dir/<file name>_<path checksum>.prof. The wrapper keeps
+    extract's __name__, so cache and manifest keys are the same with and
+    without tracing.
+    """
+
+    def __init__(self, extract, trace_path, profile_dir=None, profile_every=0):
+        self.extract = extract
+        self.trace_path = trace_path
+        self.profile_dir = profile_dir
+        self.profile_every = profile_every
+        self.__name__ = extract.__name__
+
+    def __call__(self, audio_path):
+        global _active
+        timer = StageTimer()
+        profiler = None
+        profile_path = None
+        if self.profile_dir and profile_sampled(audio_path, self.profile_every):
+            profiler = cProfile.Profile()
+            # Recordings often share a file name, so the path's checksum keeps profiles apart
+            stem = os.path.splitext(os.path.basename(audio_path))[0]
+            profile_path = os.path.join(
+                self.profile_dir, f"{stem}_{zlib.crc32(audio_path.encode()):08x}.prof")
+        error = None
+        previous, _active = _active, timer
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            return self.extract(audio_path)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            total = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                os.makedirs(self.profile_dir, exist_ok=True)
+                profiler.dump_stats(profile_path)
+            _active = previous
+            append_trace(self.trace_path, {'audio_path': audio_path, 'pid': os.getpid(),
+                                           'total': round(total, 6), **timer.record(),
+                                           'error': error, 'profile': profile_path})
+
+
+def summarize_trace(records):
+    """{stage: {'files', 'total', 'mean', 'p50', 'p95'}} over per-file trace records.
+
+    Time spent outside every top-level stage is reported as 'other'.
+    """
+    samples = {}
+    for record in records:
+        if 'audio_path' not in record:
+            continue
+        stages = dict(record['stages'])
+        top_level = sum(seconds for name, seconds in stages.items() if '/' not in name)
+        stages['other'] = max(0.0, record['total'] - top_level)
+        stages['total'] = record['total']
+        for name, seconds in stages.items():
+            samples.setdefault(name, []).append(seconds)
+    return {name: {'files': len(values), 'total': float(np.sum(values)),
+                   'mean': float(np.mean(values)), 'p50': float(np.percentile(values, 50)),
+                   'p95': float(np.percentile(values, 95))}
+            for name, values in samples.items()}
+
+
+def print_trace_summary(records, run_stages=None):
+    """Print per-file stage times (and the run's own stages) as a table."""
+    summary = summarize_trace(records)
+    if summary:
+        file_time = summary['total']['total']
+        print(f"\n⏱️  Per-file stages ({summary['total']['files']} files extracted):")
+        print(f"   {'stage':<32} {'files':>6} {'total s':>9} {'mean ms':>9} "
+              f"{'p50 ms':>9} {'p95 ms':>9} {'share':>7}")
+        # Slowest top-level stages first, each followed by its nested stages
+        def order(name):
+            top = name.split('/')[0]
+            return (name == 'other', -summary[top]['total'], top, '/' in name, -summary[name]['total'])
+        names = sorted((name for name in summary if name != 'total'), key=order)
+        for name in names + ['total']:
+            row = summary[name]
+            share = f"{row['total'] / file_time * 100:6.1f}%" if file_time and '/' not in name else ''
+            print(f"   {name:<32} {row['files']:>6} {row['total']:9.2f} {row['mean'] * 1000:9.1f} "
+                  f"{row['p50'] * 1000:9.1f} {row['p95'] * 1000:9.1f} {share:>7}")
+        counters = {}
+        for record in records:
+            for name, n in record.get('counters', {}).items():
+                counters[name] = counters.get(name, 0) + n
+        if counters:
+            print("   counters: " + ', '.join(f"{name}={n}" for name, n in sorted(counters.items())))
+    if run_stages:
+        print(f"\n⏱️  Run stages:")
+        for name, seconds in run_stages.items():
+            print(f"   {name:<32} {seconds:9.2f} s")
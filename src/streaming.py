@@ -0,0 +1,264 @@
+import numpy as np
+import parselmouth
+import soundfile as sf
+from utils import (ALL_FEATURE_KEYS, ZCR_FRAME_LENGTH_MS, ZCR_HOP_MS,
+                   run_length_encode, period_peak_amplitudes,
+                   sign_change_counts, hnr_track)
+from pitch_config import PitchConfig
+from audio_analysis import to_harmonicity
+from prescreen import PRESCREEN_STATUS_KEY, screen_file_blocks
+from trim import TRIM_KEYS, ActiveRegion, trim_from_region
+from stage_timer import stage, count
+
+
+BLOCK_SECONDS = 60.0
+OVERLAP_SECONDS = 0.2  # context shared by neighbouring blocks, >= 2x the pitch/ZCR windows
+PITCH_TIME_STEP = 0.01
+
+
+class RunningStats:
+    """Count, mean, population variance, min and max merged block by block (Chan et al.)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """Fold a block of values into the running statistics."""
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return
+        count = len(values)
+        mean = values.mean()
+        m2 = np.sum((values - mean) ** 2)
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else None
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance) if self.count else None
+
+
+class VoicingRuns:
+    """Voiced/unvoiced run statistics for a voicing mask that arrives in pieces."""
+
+    def __init__(self):
+        self.frames = 0
+        self.voiced_frames = 0
+        self.voiced_runs = 0
+        self.unvoiced_runs = 0
+        self.break_lengths = []
+        self.current_value = None
+        self.current_length = 0
+        self.current_is_break = False
+
+    def _close_run(self):
+        if self.current_value is None:
+            return
+        if self.current_value:
+            self.voiced_runs += 1
+        else:
+            self.unvoiced_runs += 1
+            if self.current_is_break:
+                self.break_lengths.append(self.current_length)
+
+    def update(self, voiced_mask):
+        """Append the next piece of the voicing mask."""
+        voiced_mask = np.asarray(voiced_mask, dtype=bool)
+        self.frames += len(voiced_mask)
+        self.voiced_frames += int(np.sum(voiced_mask))
+        starts, lengths, values = run_length_encode(voiced_mask)
+        for length, value in zip(lengths, values):
+            if value == self.current_value:
+                self.current_length += length
+                continue
+            self._close_run()
+            self.current_is_break = self.current_value is not None and not value
+            self.current_value = value
+            self.current_length = length
+
+    def finish(self):
+        """Close the last run."""
+        self._close_run()
+        self.current_value = None
+
+
+def _blocks(audio_path, block_seconds, overlap_seconds):
+    """Yield (sampling_frequency, block_start, owned_start, owned_end, samples) for overlapping blocks.
+
+    Every sample belongs to exactly one block's owned range [owned_start, owned_end);
+    the rest of the block is context shared with its neighbours.
+    """
+    info = sf.info(audio_path)
+    sampling_frequency = info.samplerate
+    total = info.frames
+    overlap = 2 * int(round(overlap_seconds * sampling_frequency / 2))
+    block = max(int(round(block_seconds * sampling_frequency)), 2 * overlap + 1)
+
+    start = 0
+    for data in sf.blocks(audio_path, blocksize=block, overlap=overlap,
+                          always_2d=True, dtype='float64'):
+        end = start + len(data)
+        owned_start = start if start == 0 else start + overlap // 2
+        owned_end = end if end >= total else end - overlap // 2
+        if owned_end > owned_start:
+            yield sampling_frequency, start, owned_start, owned_end, data.T
+        start = end - overlap
+
+
+def extract_all_features_streaming(audio_path, block_seconds=BLOCK_SECONDS,
+                                   overlap_seconds=OVERLAP_SECONDS,
+                                   frame_length_ms=ZCR_FRAME_LENGTH_MS, hop_ms=ZCR_HOP_MS,
+                                   pitch_config=None):
+    """Pitch-based and ZCR features of a long WAV file read block by block.
+
+    Peak memory is bounded by one block regardless of file duration. Each
+    block is pitch-tracked with its overlap as context, and only frames in the
+    samples it owns are kept. Statistics are merged exactly across blocks:
+    running mean/variance/min/max for F0, ZCR frames, amplitudes and the
+    Harmonicity frames, and carried-over runs for voicing.
+    Features that need a whole-file PointProcess (the pulse-based
+    jitter/shimmer columns, all but jitter_manual and shimmer_manual) are
+    None in this mode. Pitch uses
+    pitch_config with a fixed time step (PITCH_TIME_STEP unless the config
+    sets one); a two-pass config estimates the speaker range per block.
+    The prescreen also reads the file in blocks, and files it rejects
+    return all None without being analysed. Nothing is trimmed, so the
+    trim columns describe the whole file.
+    """
+    features = {key: None for key in ALL_FEATURE_KEYS + TRIM_KEYS}
+    screen = screen_file_blocks(audio_path)
+    features[PRESCREEN_STATUS_KEY] = screen.status
+    if screen.rejected:
+        return features
+    features.update(trim_from_region(ActiveRegion(0.0, screen.duration, screen.duration)))
+    f0_stats = RunningStats()
+    amplitude_stats = RunningStats()
+    harmonicity_stats = RunningStats()
+    harmonicity_frames = 0
+    zcr_stats = RunningStats()
+    voicing = VoicingRuns()
+    crossings = 0
+    n_samples = 0
+    zcr_frame_length = zcr_hop = None
+    pitch_config = pitch_config or PitchConfig()
+    pitch_time_step = pitch_config.time_step or PITCH_TIME_STEP
+
+    for fs, block_start, owned_start, owned_end, samples in _blocks(
+            audio_path, block_seconds, overlap_seconds):
+        count('blocks')
+        mono = samples.mean(axis=0)
+        owned = slice(owned_start - block_start, owned_end - block_start)
+
+        # ZCR: sign changes ending in the owned samples, frames starting in them
+        with stage('zcr'):
+            counts = sign_change_counts(samples)
+            first = max(owned.start, 1)
+            crossings += np.mean(counts[:, owned.stop - 1] - counts[:, first - 1])
+            n_samples += owned.stop - owned.start
+            if zcr_frame_length is None:
+                zcr_frame_length = max(2, int(round(frame_length_ms * fs / 1000)))
+                zcr_hop = max(1, int(round(hop_ms * fs / 1000)))
+            frame_starts = np.arange(
+                -(-owned_start // zcr_hop) * zcr_hop, owned_end, zcr_hop) - block_start
+            frame_starts = frame_starts[frame_starts + zcr_frame_length <= samples.shape[1]]
+            zcr_stats.update(np.mean(
+                counts[:, frame_starts + zcr_frame_length - 1] - counts[:, frame_starts],
+                axis=0) / zcr_frame_length)
+
+        # Harmonicity and pitch on the whole block, keeping frames centred in the owned samples
+        sound = parselmouth.Sound(samples, sampling_frequency=fs)
+        try:
+            with stage('harmonicity'):
+                harmonicity_times, frame_hnr = hnr_track(
+                    to_harmonicity(sound, minimum_pitch=pitch_config.floor))
+            owned_frames = ((harmonicity_times >= owned.start / fs) &
+                            (harmonicity_times < owned.stop / fs))
+            harmonicity_frames += np.count_nonzero(owned_frames)
+            frame_hnr = frame_hnr[owned_frames]
+            harmonicity_stats.update(frame_hnr[np.isfinite(frame_hnr)])
+        except Exception as e:
+            pass
+        try:
+            with stage('pitch'):
+                pitch = pitch_config.to_pitch(sound, time_step=pitch_time_step)
+        except Exception as e:
+            continue
+        pitch_values = pitch.selected_array['frequency']
+        times = pitch.x1 + np.arange(len(pitch_values)) * pitch.dx
+        keep = ((times >= owned.start / fs) & (times < owned.stop / fs))
+        pitch_values = pitch_values[keep]
+        times = times[keep]
+        voiced = pitch_values > 0
+
+        voicing.update(voiced)
+        f0_stats.update(pitch_values[voiced])
+        with stage('period_amplitudes'):
+            amplitude_stats.update(period_peak_amplitudes(
+                mono, fs, times[voiced], pitch_values[voiced], start_time=sound.x1))
+
+    voicing.finish()
+    frame_step = pitch_time_step
+
+    if n_samples >= 2 and zcr_stats.count:
+        features.update({
+            'zcr_overall': crossings / n_samples,
+            'zcr_mean': zcr_stats.mean,
+            'zcr_std': zcr_stats.std,
+            'zcr_min': zcr_stats.min,
+            'zcr_max': zcr_stats.max
+        })
+
+    if f0_stats.count:
+        features.update({
+            'f0_mean': f0_stats.mean,
+            'f0_min': f0_stats.min,
+            'f0_max': f0_stats.max,
+            'f0_range': f0_stats.max - f0_stats.min,
+            'f0_std': f0_stats.std
+        })
+    if harmonicity_stats.count:
+        features.update({
+            'hnr_mean': harmonicity_stats.mean,
+            'hnr_std': harmonicity_stats.std,
+            'hnr_min': harmonicity_stats.min,
+            'hnr_max': harmonicity_stats.max,
+            'hnr_voiced_fraction': harmonicity_stats.count / harmonicity_frames
+        })
+    if f0_stats.count > 5:
+        features['jitter_manual'] = f0_stats.std / f0_stats.mean
+    if amplitude_stats.count > 5:
+        features['shimmer_manual'] = amplitude_stats.std / amplitude_stats.mean
+
+    if voicing.frames:
+        unvoiced_frames = voicing.frames - voicing.voiced_frames
+        avg_voiced = voicing.voiced_frames / voicing.voiced_runs if voicing.voiced_runs else 0
+        avg_unvoiced = unvoiced_frames / voicing.unvoiced_runs if voicing.unvoiced_runs else 0
+        break_durations = np.asarray(voicing.break_lengths) * frame_step
+        features.update({
+            'voice_breaks_count': len(break_durations),
+            'voiced_percentage': voicing.voiced_frames / voicing.frames * 100,
+            'unvoiced_percentage': unvoiced_frames / voicing.frames * 100,
+            'avg_voiced_duration': avg_voiced,
+            'avg_unvoiced_duration': avg_unvoiced,
+            'voiced_segments_count': voicing.voiced_runs,
+            'unvoiced_segments_count': voicing.unvoiced_runs,
+            'avg_voiced_duration_sec': avg_voiced * frame_step,
+            'avg_unvoiced_duration_sec': avg_unvoiced * frame_step,
+            'median_break_duration_sec': np.median(break_durations) if len(break_durations) else 0,
+            'p90_break_duration_sec': np.percentile(break_durations, 90) if len(break_durations) else 0
+        })
+
+    return features
@@ -0,0 +1,104 @@
+import os
+import numpy as np
+import soundfile as sf
+
+
+SAMPLING_FREQUENCY = 16000
+N_HARMONICS = 10
+VOICED_SECONDS = 2.0  # voiced stretch between pauses
+PAUSE_SECONDS = 0.3
+_BLOCK_SAMPLES = 1 << 20
+
+
+class VoiceSpec:
+    """Parameters of a synthetic sustained voice.
+
+    A harmonic series (1/k amplitudes) whose periods vary by `jitter`
+    (relative std of period length), whose per-period amplitudes vary by
+    `shimmer` (relative std) and with white noise added at `hnr_db`.
+    Voiced stretches alternate with noise-only pauses, so every file also
+    has voice breaks. The same spec and seed always give the same samples.
+    """
+
+    def __init__(self, duration, f0=150.0, jitter=0.01, shimmer=0.05, hnr_db=20.0,
+                 pauses=True, seed=0, sampling_frequency=SAMPLING_FREQUENCY):
+        self.duration = float(duration)
+        self.f0 = f0
+        self.jitter = jitter
+        self.shimmer = shimmer
+        self.hnr_db = hnr_db
+        self.pauses = pauses
+        self.seed = seed
+        self.sampling_frequency = sampling_frequency
+
+    @property
+    def name(self):
+        """File name stem encoding every parameter."""
+        return (f"voice_{self.duration:g}s_f0{self.f0:g}_j{self.jitter:g}_s{self.shimmer:g}"
+                f"_hnr{self.hnr_db:g}{'_p' if self.pauses else ''}_seed{self.seed}"
+                f"_{self.sampling_frequency}hz")
+
+    def params(self):
+        return {'duration': self.duration, 'f0': self.f0, 'jitter': self.jitter,
+                'shimmer': self.shimmer, 'hnr_db': self.hnr_db, 'pauses': self.pauses,
+                'seed': self.seed, 'sampling_frequency': self.sampling_frequency}
+
+
+def _periods(spec, rng):
+    """Start times, lengths and amplitudes of every glottal period up to spec.duration."""
+    n_periods = int(spec.duration * spec.f0 * 1.2) + 16
+    lengths = (1 / spec.f0) * (1 + spec.jitter * rng.standard_normal(n_periods))
+    lengths = np.maximum(lengths, 0.25 / spec.f0)
+    amplitudes = np.maximum(1 + spec.shimmer * rng.standard_normal(n_periods), 0.05)
+    starts = np.concatenate([[0.0], np.cumsum(lengths)[:-1]])
+    return starts, lengths, amplitudes
+
+
+def synthesize_block(spec, periods, start, stop):
+    """Samples [start, stop) of the spec's signal, given the output of _periods."""
+    period_starts, period_lengths, amplitudes = periods
+    fs = spec.sampling_frequency
+    t = np.arange(start, stop) / fs
+    index = np.searchsorted(period_starts, t, side='right') - 1
+    phase = 2 * np.pi * (index + (t - period_starts[index]) / period_lengths[index])
+
+    harmonics = np.arange(1, N_HARMONICS + 1)
+    voice = np.zeros(len(t))
+    for k in harmonics:
+        voice += np.sin(k * phase) / k
+    voice *= amplitudes[index]
+
+    # Noise power set by the HNR of the (unit-amplitude) harmonic series
+    harmonic_power = 0.5 * np.sum(1.0 / harmonics ** 2)
+    noise_std = np.sqrt(harmonic_power / 10 ** (spec.hnr_db / 10))
+    noise_rng = np.random.default_rng([spec.seed, start // _BLOCK_SAMPLES])
+    noise = noise_std * noise_rng.standard_normal(len(t))
+
+    if spec.pauses:
+        cycle = VOICED_SECONDS + PAUSE_SECONDS
+        voice[(t % cycle) >= VOICED_SECONDS] = 0.0
+    return 0.2 * (voice + noise)
+
+
+def write_voice(spec, path):
+    """Write the spec's signal as 16-bit PCM, block by block so 30-minute files fit in memory."""
+    rng = np.random.default_rng(spec.seed)
+    periods = _periods(spec, rng)
+    n_samples = int(round(spec.duration * spec.sampling_frequency))
+    tmp_path = path + '.tmp'
+    with sf.SoundFile(tmp_path, 'w', samplerate=spec.sampling_frequency, channels=1,
+                      subtype='PCM_16', format='WAV') as f:
+        for start in range(0, n_samples, _BLOCK_SAMPLES):
+            stop = min(start + _BLOCK_SAMPLES, n_samples)
+            f.write(np.clip(synthesize_block(spec, periods, start, stop), -1, 1))
+    os.replace(tmp_path, path)
+    return path
+
+
+def voice_fixture(spec, fixture_dir):
+    """Path of the spec's WAV file in fixture_dir, generating it on first use."""
+    os.makedirs(fixture_dir, exist_ok=True)
+    path = os.path.join(fixture_dir, spec.name + '.wav')
+    if not os.path.exists(path):
+        write_voice(spec, path)
+    return path
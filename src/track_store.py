@@ -0,0 +1,205 @@
+import os
+import json
+import numpy as np
+from audio_analysis import AudioAnalysis
+from pitch_store import PitchStore
+from utils import ZCR_FRAME_LENGTH_MS, ZCR_HOP_MS, zcr_track, hnr_track
+
+
+STORE_VERSION = 1
+TRACK_DTYPE = np.dtype('<f4')
+SHARD_BYTES = 256 * 1024 * 1024  # a new shard is started once the current one is this large
+TRACK_NAMES = ('pitch', 'voicing', 'zcr', 'hnr', 'intensity')
+_MANIFEST = 'manifest.json'
+
+
+class FrameTrack:
+    """One frame-level track: values[i] belongs to time x1 + i * dx (seconds)."""
+
+    def __init__(self, values, x1, dx):
+        self.values = values
+        self.x1 = float(x1)
+        self.dx = float(dx)
+
+    def __len__(self):
+        return len(self.values)
+
+    def times(self):
+        """Frame centre times in seconds."""
+        return self.x1 + np.arange(len(self.values)) * self.dx
+
+
+def _pitch_track(analysis):
+    pitch = analysis.pitch
+    return FrameTrack(pitch.selected_array['frequency'], pitch.x1, pitch.dx)
+
+
+def _voicing_track(analysis):
+    pitch = analysis.pitch
+    return FrameTrack(pitch.selected_array['frequency'] > 0, pitch.x1, pitch.dx)
+
+
+def _zcr_track(analysis):
+    samples = analysis.samples
+    fs = samples.sampling_frequency
+    # Same frame grid as zcr_track: frames start every hop samples
+    frame_length = max(2, int(round(ZCR_FRAME_LENGTH_MS * fs / 1000)))
+    hop = max(1, int(round(ZCR_HOP_MS * fs / 1000)))
+    rates = zcr_track(samples.values, fs).mean(axis=0)
+    return FrameTrack(rates, frame_length / 2 / fs, hop / fs)
+
+
+def _hnr_track(analysis):
+    harmonicity = analysis.harmonicity
+    _, values = hnr_track(harmonicity)
+    return FrameTrack(values, harmonicity.x1, harmonicity.dx)
+
+
+def _intensity_track(analysis):
+    intensity = analysis.intensity
+    return FrameTrack(intensity.values[0], intensity.x1, intensity.dx)
+
+
+TRACK_BUILDERS = {
+    'pitch': _pitch_track,  # Hz, 0 where unvoiced
+    'voicing': _voicing_track,  # 1 voiced, 0 unvoiced, on the pitch frames
+    'zcr': _zcr_track,  # crossings per sample, averaged over channels
+    'hnr': _hnr_track,  # dB, NaN where Praat found no periodicity
+    'intensity': _intensity_track,  # dB
+}
+
+
+def frame_tracks(analysis, names=TRACK_NAMES):
+    """{name: float32 FrameTrack} of one file or AudioAnalysis; tracks that fail to build are left out."""
+    analysis = AudioAnalysis.of(analysis)
+    tracks = {}
+    for name in names:
+        try:
+            track = TRACK_BUILDERS[name](analysis)
+        except Exception as e:
+            continue
+        tracks[name] = FrameTrack(np.asarray(track.values, dtype=TRACK_DTYPE), track.x1, track.dx)
+    return tracks
+
+
+class TrackExtractor:
+    """Picklable frame_tracks for run_batch, reusing stored pitch tracks when pitch_store_dir is set.
+
+    Raises if no track could be built, so the file is reported as failed.
+    """
+
+    def __init__(self, names=TRACK_NAMES, pitch_config=None, pitch_store_dir=None):
+        self.names = list(names)
+        self.pitch_config = pitch_config
+        self.pitch_store_dir = pitch_store_dir
+        self.__name__ = f"frame_tracks[{','.join(self.names)}]"
+
+    def __call__(self, audio_path):
+        pitch = None
+        if self.pitch_store_dir and {'pitch', 'voicing'} & set(self.names):
+            try:
+                pitch = PitchStore(self.pitch_store_dir).get_or_compute(audio_path, self.pitch_config)
+            except Exception as e:
+                pitch = None
+        tracks = frame_tracks(AudioAnalysis(audio_path, pitch, self.pitch_config), self.names)
+        if not tracks:
+            raise RuntimeError("no frame track could be computed")
+        return tracks
+
+
+class TrackStore:
+    """Frame-level tracks of many files, memory-mappable by audio ID.
+
+    Tracks are appended to raw little-endian float32 files, one per track
+    name in each shard directory (shard_00000/pitch.f32, ...). A shard is
+    closed once it holds SHARD_BYTES, which keeps files a manageable size.
+    The manifest maps each ID to its shard and, per track, the frame
+    offset, length and timing (x1, dx); it also records how many frames of
+    each shard file are committed. It is replaced atomically, so bytes
+    left behind by an interrupted write are ignored and overwritten.
+    Re-exporting an ID appends new data and repoints the ID; the old
+    frames stay in their shard unused.
+    """
+
+    def __init__(self, store_dir, shard_bytes=SHARD_BYTES):
+        self.store_dir = store_dir
+        self.shard_bytes = shard_bytes
+        os.makedirs(store_dir, exist_ok=True)
+        manifest_path = os.path.join(store_dir, _MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') != STORE_VERSION:
+                raise ValueError(
+                    f"Unsupported track store version: {manifest.get('version')}")
+        else:
+            manifest = {'version': STORE_VERSION, 'shards': [], 'files': {}}
+        self.shards = manifest['shards']
+        self.files = manifest['files']
+
+    def __contains__(self, audio_id):
+        return str(audio_id) in self.files
+
+    def __len__(self):
+        return len(self.files)
+
+    def _shard_dir(self, shard):
+        return os.path.join(self.store_dir, f"shard_{shard:05d}")
+
+    def _track_path(self, shard, name):
+        return os.path.join(self._shard_dir(shard), name + '.f32')
+
+    def _save_manifest(self):
+        manifest_path = os.path.join(self.store_dir, _MANIFEST)
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': STORE_VERSION, 'shards': self.shards,
+                       'files': self.files}, f)
+        os.replace(tmp_path, manifest_path)
+
+    def entry(self, audio_id):
+        """Manifest entry of an ID: shard, tracks and whatever metadata was stored with it."""
+        return self.files.get(str(audio_id))
+
+    def append(self, audio_id, tracks, **meta):
+        """Write {name: FrameTrack} for an ID; visible to readers after commit()."""
+        if not self.shards or sum(self.shards[-1].values()) * TRACK_DTYPE.itemsize >= self.shard_bytes:
+            self.shards.append({})
+            os.makedirs(self._shard_dir(len(self.shards) - 1), exist_ok=True)
+        shard = len(self.shards) - 1
+        lengths = self.shards[shard]
+        entry = {'shard': shard, 'tracks': {}, **meta}
+        for name, track in tracks.items():
+            values = np.asarray(track.values, dtype=TRACK_DTYPE)
+            with open(self._track_path(shard, name), 'ab') as f:
+                # Drop bytes an interrupted run wrote past the committed frames
+                f.truncate(lengths.get(name, 0) * TRACK_DTYPE.itemsize)
+                values.tofile(f)
+            entry['tracks'][name] = {'offset': lengths.get(name, 0), 'length': len(values),
+                                     'x1': track.x1, 'dx': track.dx}
+            lengths[name] = lengths.get(name, 0) + len(values)
+        self.files[str(audio_id)] = entry
+
+    def commit(self):
+        """Make every appended track visible by saving the manifest."""
+        self._save_manifest()
+
+    def track(self, audio_id, name):
+        """Read-only memory-mapped FrameTrack of one ID, or None if it has no such track."""
+        entry = self.entry(audio_id)
+        if entry is None or name not in entry['tracks']:
+            return None
+        meta = entry['tracks'][name]
+        if meta['length'] == 0:
+            values = np.empty(0, dtype=TRACK_DTYPE)
+        else:
+            values = np.memmap(self._track_path(entry['shard'], name), dtype=TRACK_DTYPE, mode='r',
+                               offset=meta['offset'] * TRACK_DTYPE.itemsize, shape=(meta['length'],))
+        return FrameTrack(values, meta['x1'], meta['dx'])
+
+    def tracks(self, audio_id):
+        """{name: FrameTrack} of every track stored for an ID."""
+        entry = self.entry(audio_id)
+        if entry is None:
+            return {}
+        return {name: self.track(audio_id, name) for name in entry['tracks']}
@@ -0,0 +1,113 @@
+import numpy as np
+
+
+TRIM_THRESHOLD_DB = -35.0  # frame energy relative to the loudest frame
+TRIM_FRAME_SECONDS = 0.02
+TRIM_PADDING_SECONDS = 0.1  # kept on both sides, so the pitch window has context at the edges
+_BLOCK_SAMPLES = 1 << 20
+TRIM_KEYS = ['active_start_sec', 'active_end_sec', 'trimmed_sec']
+
+
+class TrimConfig:
+    """Energy-based trimming of leading and trailing silence.
+
+    A frame of frame_length seconds is active when its energy is within
+    threshold_db of the loudest frame. The Sound is cropped to the first
+    through last active frame plus padding on both sides. With
+    keep_silence_in_voicing=True the trimmed seconds still count as
+    unvoiced in the voiced/unvoiced percentages, so they stay comparable
+    with untrimmed runs.
+    """
+
+    def __init__(self, threshold_db=TRIM_THRESHOLD_DB, padding=TRIM_PADDING_SECONDS,
+                 frame_length=TRIM_FRAME_SECONDS, keep_silence_in_voicing=False):
+        if threshold_db >= 0:
+            raise ValueError(f"Trim threshold must be negative (dB below the loudest frame), got {threshold_db}")
+        if padding < 0 or frame_length <= 0:
+            raise ValueError("Trim padding must be >= 0 and frame length > 0")
+        self.threshold_db = float(threshold_db)
+        self.padding = float(padding)
+        self.frame_length = float(frame_length)
+        self.keep_silence_in_voicing = keep_silence_in_voicing
+
+    def params(self):
+        return {'threshold_db': self.threshold_db, 'padding': self.padding,
+                'frame_length': self.frame_length,
+                'keep_silence_in_voicing': self.keep_silence_in_voicing}
+
+
+class ActiveRegion:
+    """[start, end) in seconds of the part of a file that is analysed, out of duration."""
+
+    def __init__(self, start, end, duration, keep_silence_in_voicing=False):
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.keep_silence_in_voicing = keep_silence_in_voicing
+
+    @property
+    def trimmed(self):
+        """Seconds of leading plus trailing silence cut off."""
+        return self.start + (self.duration - self.end)
+
+    def __repr__(self):
+        return f"ActiveRegion(start={self.start:.3f}, end={self.end:.3f}, duration={self.duration:.3f})"
+
+
+def frame_energies_db(values, frame_length):
+    """Mean energy (dB) of consecutive frame_length-sample frames over all channels, block by block."""
+    n_channels, n_samples = values.shape
+    n_frames = n_samples // frame_length
+    energies = np.empty(n_frames)
+    frames_per_block = max(1, _BLOCK_SAMPLES // frame_length)
+    for start in range(0, n_frames, frames_per_block):
+        stop = min(start + frames_per_block, n_frames)
+        block = values[:, start * frame_length:stop * frame_length].astype(np.float64)
+        block = block.reshape(n_channels, stop - start, frame_length)
+        energies[start:stop] = np.mean(block ** 2, axis=(0, 2))
+    with np.errstate(divide='ignore'):
+        return 10 * np.log10(energies)
+
+
+def active_region(samples, trim_config=None):
+    """ActiveRegion of a WavSamples or Sound; the whole file when trim_config is None or nothing stands out.
+
+    Integer samples give the same region as their float scaling, since
+    only energies relative to the loudest frame are compared.
+    """
+    fs = samples.sampling_frequency
+    duration = samples.values.shape[1] / fs
+    if trim_config is None:
+        return ActiveRegion(0.0, duration, duration)
+
+    frame_length = max(1, int(round(trim_config.frame_length * fs)))
+    energies = frame_energies_db(samples.values, frame_length)
+    if len(energies) == 0 or not np.isfinite(energies.max()):
+        return ActiveRegion(0.0, duration, duration, trim_config.keep_silence_in_voicing)
+    active = np.flatnonzero(energies >= energies.max() + trim_config.threshold_db)
+    start = max(0.0, active[0] * frame_length / fs - trim_config.padding)
+    end = min(duration, (active[-1] + 1) * frame_length / fs + trim_config.padding)
+    return ActiveRegion(start, end, duration, trim_config.keep_silence_in_voicing)
+
+
+def crop(sound, region):
+    """The part of a Sound inside region, keeping absolute times; the Sound itself if nothing is cut."""
+    if region.start <= sound.xmin and region.end >= sound.xmax:
+        return sound
+    return sound.extract_part(from_time=region.start, to_time=region.end, preserve_times=True)
+
+
+def trim_sound(sound, trim_config=None):
+    """A Sound cropped to its active region; the Sound itself when trim_config is None."""
+    if trim_config is None:
+        return sound
+    return crop(sound, active_region(sound, trim_config))
+
+
+def trim_from_region(region):
+    """Trim offsets of a file as features."""
+    return {
+        'active_start_sec': region.start,
+        'active_end_sec': region.end,
+        'trimmed_sec': region.trimmed
+    }
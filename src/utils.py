@@ -1,20 +1,51 @@
-import os
-import parselmouth
 import numpy as np
+from audio_index import AudioIndex
+from audio_analysis import AudioAnalysis
+from stage_timer import stage
+from perturbation import (SHIMMER_MEASURES, jitter_from_pulses, pulse_amplitudes,
+                          shimmer_from_pulses)
+
+
+JITTER_KEYS = ['jitter_local', 'jitter_rap',
+               'jitter_ppq5', 'jitter_ddp', 'jitter_manual']
+SHIMMER_KEYS = ['shimmer_local', 'shimmer_local_db', 'shimmer_apq3',
+                'shimmer_apq5', 'shimmer_apq11', 'shimmer_manual']
+F0_KEYS = ['f0_mean', 'f0_min', 'f0_max', 'f0_range', 'f0_std']
+HNR_KEYS = ['hnr_mean', 'hnr_std', 'hnr_min', 'hnr_max', 'hnr_voiced_fraction']
+ZCR_KEYS = ['zcr_overall', 'zcr_mean', 'zcr_std', 'zcr_min', 'zcr_max']
+VOICE_BREAKS_KEYS = ['voice_breaks_count', 'voiced_percentage', 'unvoiced_percentage',
+                     'avg_voiced_duration', 'avg_unvoiced_duration',
+                     'voiced_segments_count', 'unvoiced_segments_count',
+                     'avg_voiced_duration_sec', 'avg_unvoiced_duration_sec',
+                     'median_break_duration_sec', 'p90_break_duration_sec']
+ALL_FEATURE_KEYS = (JITTER_KEYS + SHIMMER_KEYS + F0_KEYS +
+                    HNR_KEYS + ZCR_KEYS + VOICE_BREAKS_KEYS)
+
+HNR_WINDOW_LENGTH = 0.04  # seconds of signal per spectral HNR frame
+HNR_HARMONICS = 5
+HNR_TOLERANCE = 0.1  # fraction of f0 around each harmonic
+HNR_FRAME_BLOCK = 1024
+HNR_UNVOICED_DB = -200  # Praat's Harmonicity value for silent or aperiodic frames
+ZCR_FRAME_LENGTH_MS = 25
+ZCR_HOP_MS = 10
+
+
+_AUDIO_INDEXES = {}
+
+
+def get_audio_index(base_dir):
+    """Build (once per process) the ID -> path index for base_dir."""
+    if base_dir not in _AUDIO_INDEXES:
+        _AUDIO_INDEXES[base_dir] = AudioIndex.build(base_dir)
+    return _AUDIO_INDEXES[base_dir]
 
 
 def find_audio_path(base_dir, audio_id):
-    """Recursively search all subfolders under '0' and '1' for a .wav file containing audio_id in its name."""
-    for subdir in ['0', '1']:
-        search_dir = os.path.join(base_dir, subdir)
-        if not os.path.isdir(search_dir):
-            continue
-        for root, dirs, files in os.walk(search_dir):
-            for file in files:
-                if file.endswith('.wav') and audio_id in file:
-                    print(
-                        f"Found file for {audio_id}: {os.path.join(root, file)}")
-                    return os.path.join(root, file)
+    """Look up the .wav file for audio_id under the '0' and '1' subfolders via the audio index."""
+    path = get_audio_index(base_dir).first_path(audio_id)
+    if path:
+        print(f"Found file for {audio_id}: {path}")
+        return path
     print(
         f"No .wav file found for audio_id {audio_id} in any subfolder of '0' or '1'")
     return None
@@ -22,407 +53,431 @@ def find_audio_path(base_dir, audio_id):
 
 def find_all_audio_paths(base_dir, audio_ids):
     """Find audio paths for all audio IDs."""
-    audio_paths = {}
-    for audio_id in audio_ids:
-        path = find_audio_path(base_dir, audio_id)
-        if path:
-            audio_paths[audio_id] = path
-    return audio_paths
+    return get_audio_index(base_dir).first_paths(audio_ids)
 
 
-def extract_jitter(audio_path):
-    """Extract jitter (frequency perturbation) from audio file."""
+def jitter_from_pitch(pitch, pulses):
+    """Compute jitter features from an already-computed Pitch and glottal pulse times."""
+    # Local, RAP, PPQ5 and DDP from the pulse periods, as Praat computes them
+    with stage('perturbation'):
+        jitter = jitter_from_pulses(pulses)
+    jitter_values = {f'jitter_{measure}': value for measure, value in jitter.items()}
+
+    # Manual calculation using pitch variation
     try:
-        # Load audio file
-        sound = parselmouth.Sound(audio_path)
-
-        # Extract pitch
-        pitch = sound.to_pitch()
-
-        # Extract PointProcess from pitch
-        point_process = pitch.to_point_process()
-
-        # Try different jitter extraction methods
-        jitter_values = {}
-
-        # Method 1: Jitter (local)
-        try:
-            jitter_local = point_process.get_jitter_local()
-            jitter_values['jitter_local'] = jitter_local
-        except:
-            jitter_values['jitter_local'] = None
-
-        # Method 2: Jitter (rap)
-        try:
-            jitter_rap = point_process.get_jitter_rap()
-            jitter_values['jitter_rap'] = jitter_rap
-        except:
-            jitter_values['jitter_rap'] = None
-
-        # Method 3: Jitter (ppq5)
-        try:
-            jitter_ppq5 = point_process.get_jitter_ppq5()
-            jitter_values['jitter_ppq5'] = jitter_ppq5
-        except:
-            jitter_values['jitter_ppq5'] = None
-
-        # Method 4: Jitter (ddp)
-        try:
-            jitter_ddp = point_process.get_jitter_ddp()
-            jitter_values['jitter_ddp'] = jitter_ddp
-        except:
-            jitter_values['jitter_ddp'] = None
-
-        # Method 5: Manual calculation using pitch variation
-        try:
-            pitch_values = pitch.selected_array['frequency']
-            voiced_pitch = pitch_values[pitch_values > 0]
-            if len(voiced_pitch) > 5:
-                # Calculate jitter as coefficient of variation of pitch
-                jitter_manual = np.std(voiced_pitch) / np.mean(voiced_pitch)
-                jitter_values['jitter_manual'] = jitter_manual
-            else:
-                jitter_values['jitter_manual'] = None
-        except:
+        pitch_values = pitch.selected_array['frequency']
+        voiced_pitch = pitch_values[pitch_values > 0]
+        if len(voiced_pitch) > 5:
+            # Calculate jitter as coefficient of variation of pitch
+            jitter_manual = np.std(voiced_pitch) / np.mean(voiced_pitch)
+            jitter_values['jitter_manual'] = jitter_manual
+        else:
             jitter_values['jitter_manual'] = None
+    except:
+        jitter_values['jitter_manual'] = None
 
-        return jitter_values
+    return jitter_values
 
-    except Exception as e:
-        return {key: None for key in ['jitter_local', 'jitter_rap', 'jitter_ppq5', 'jitter_ddp', 'jitter_manual']}
 
-
-def extract_shimmer(audio_path):
-    """Extract shimmer (amplitude perturbation) from audio file."""
+def extract_jitter(audio_path, pitch=None, pitch_config=None):
+    """Extract jitter (frequency perturbation) from an audio file or a shared AudioAnalysis."""
     try:
-        # Load audio file
-        sound = parselmouth.Sound(audio_path)
-
-        # Extract pitch
-        pitch = sound.to_pitch()
-
-        # Extract PointProcess from pitch
-        point_process = pitch.to_point_process()
-
-        # Try different shimmer extraction methods
-        shimmer_values = {}
-
-        # Method 1: Shimmer (local)
-        try:
-            shimmer_local = point_process.get_shimmer_local()
-            shimmer_values['shimmer_local'] = shimmer_local
-        except:
-            shimmer_values['shimmer_local'] = None
-
-        # Method 2: Shimmer (apq3)
-        try:
-            shimmer_apq3 = point_process.get_shimmer_apq3()
-            shimmer_values['shimmer_apq3'] = shimmer_apq3
-        except:
-            shimmer_values['shimmer_apq3'] = None
-
-        # Method 3: Shimmer (apq5)
-        try:
-            shimmer_apq5 = point_process.get_shimmer_apq5()
-            shimmer_values['shimmer_apq5'] = shimmer_apq5
-        except:
-            shimmer_values['shimmer_apq5'] = None
-
-        # Method 4: Shimmer (apq11)
-        try:
-            shimmer_apq11 = point_process.get_shimmer_apq11()
-            shimmer_values['shimmer_apq11'] = shimmer_apq11
-        except:
-            shimmer_values['shimmer_apq11'] = None
-
-        # Method 5: Manual calculation using amplitude variation
-        try:
-            # Get amplitude values at pitch points
-            pitch_values = pitch.selected_array['frequency']
-            voiced_indices = np.where(pitch_values > 0)[0]
-
-            if len(voiced_indices) > 5:
-                # Get amplitude at voiced points
-                amplitude_values = []
-                for idx in voiced_indices:
-                    time = pitch.x1 + idx * pitch.dx
-                    if time < sound.duration:
-                        amplitude = sound.get_value_at_time(time)
-                        if not np.isnan(amplitude):
-                            amplitude_values.append(abs(amplitude))
-
-                if len(amplitude_values) > 5:
-                    # Calculate shimmer as coefficient of variation of amplitude
-                    shimmer_manual = np.std(
-                        amplitude_values) / np.mean(amplitude_values)
-                    shimmer_values['shimmer_manual'] = shimmer_manual
-                else:
-                    shimmer_values['shimmer_manual'] = None
-            else:
-                shimmer_values['shimmer_manual'] = None
-        except:
-            shimmer_values['shimmer_manual'] = None
+        # Pitch and pulse times, built on first use
+        analysis = AudioAnalysis.of(audio_path, pitch, pitch_config)
 
-        return shimmer_values
+        return jitter_from_pitch(analysis.pitch, analysis.pulses)
 
     except Exception as e:
-        return {key: None for key in ['shimmer_local', 'shimmer_apq3', 'shimmer_apq5', 'shimmer_apq11', 'shimmer_manual']}
+        return {key: None for key in JITTER_KEYS}
 
 
-def extract_fundamental_frequency(audio_path):
-    """Extract Fundamental Frequency (F0) statistics from audio file."""
-    try:
-        # Load audio file
-        sound = parselmouth.Sound(audio_path)
+def period_peak_amplitudes(samples, sampling_frequency, times, f0s, start_time=0.0):
+    """Peak absolute amplitude over one pitch period centred on each time.
 
-        # Extract pitch
-        pitch = sound.to_pitch()
+    Reads the sample array once and reduces every window with a single
+    np.maximum.reduceat call instead of one Praat query per frame.
+    """
+    magnitude = np.abs(np.asarray(samples, dtype=float))
+    times = np.asarray(times, dtype=float)
+    f0s = np.asarray(f0s, dtype=float)
+    if len(times) == 0 or len(magnitude) == 0:
+        return np.empty(0)
 
-        # Get pitch values
-        pitch_values = pitch.selected_array['frequency']
-        voiced_pitch = pitch_values[pitch_values > 0]
+    centers = np.rint((times - start_time) * sampling_frequency).astype(int)
+    half_periods = np.maximum(
+        1, np.rint(sampling_frequency / f0s / 2)).astype(int)
+    starts = np.clip(centers - half_periods, 0, len(magnitude) - 1)
+    stops = np.clip(centers + half_periods + 1, starts + 1, len(magnitude))
 
-        if len(voiced_pitch) == 0:
-            return {
-                'f0_mean': None,
-                'f0_min': None,
-                'f0_max': None,
-                'f0_range': None,
-                'f0_std': None
-            }
-
-        # Calculate F0 statistics
-        f0_mean = np.mean(voiced_pitch)
-        f0_min = np.min(voiced_pitch)
-        f0_max = np.max(voiced_pitch)
-        f0_range = f0_max - f0_min
-        f0_std = np.std(voiced_pitch)
-
-        return {
-            'f0_mean': f0_mean,
-            'f0_min': f0_min,
-            'f0_max': f0_max,
-            'f0_range': f0_range,
-            'f0_std': f0_std
-        }
+    # reduceat over interleaved [start, stop) pairs; even slots hold each window's max
+    bounds = np.empty(2 * len(times), dtype=int)
+    bounds[0::2] = starts
+    bounds[1::2] = stops
+    return np.maximum.reduceat(np.append(magnitude, 0.0), bounds)[0::2]
 
-    except Exception as e:
-        return {
-            'f0_mean': None,
-            'f0_min': None,
-            'f0_max': None,
-            'f0_range': None,
-            'f0_std': None
-        }
 
+def shimmer_from_pitch(sound, pitch, pulses):
+    """Compute shimmer features from an already-loaded Sound, Pitch and glottal pulse times."""
+    # Local, dB and APQ3/5/11 from per-pulse RMS amplitudes, as Praat computes them
+    try:
+        with stage('perturbation'):
+            times, amplitudes = pulse_amplitudes(sound.values.mean(axis=0), sound.sampling_frequency,
+                                                 pulses, start_time=sound.x1)
+            shimmer = shimmer_from_pulses(times, amplitudes)
+    except Exception as e:
+        shimmer = {measure: None for measure in SHIMMER_MEASURES}
+    shimmer_values = {f'shimmer_{measure}': value for measure, value in shimmer.items()}
 
-def extract_hnr(audio_path):
-    """Extract Harmonics-to-Noise Ratio (HNR) from audio file."""
+    # Manual calculation using amplitude variation
     try:
-        # Load audio file
-        sound = parselmouth.Sound(audio_path)
-
-        # Extract pitch
-        pitch = sound.to_pitch()
-
-        # Extract PointProcess from pitch
-        point_process = pitch.to_point_process()
-
-        # Try different HNR extraction methods
-        hnr_values = {}
-
-        # Method 1: HNR (autocorrelation)
-        try:
-            hnr_autocorr = point_process.get_harmonicity_autocorrelation()
-            hnr_values['hnr_autocorr'] = hnr_autocorr
-        except:
-            hnr_values['hnr_autocorr'] = None
-
-        # Method 2: HNR (cepstral)
-        try:
-            hnr_cepstral = point_process.get_harmonicity_cepstral()
-            hnr_values['hnr_cepstral'] = hnr_cepstral
-        except:
-            hnr_values['hnr_cepstral'] = None
-
-        # Method 3: Manual calculation using spectral analysis
-        try:
-            # Get voiced segments
-            pitch_values = pitch.selected_array['frequency']
-            voiced_indices = np.where(pitch_values > 0)[0]
-
-            if len(voiced_indices) > 10:
-                # Calculate HNR for voiced segments
-                hnr_manual_values = []
-                for i in range(0, len(voiced_indices), max(1, len(voiced_indices)//10)):
-                    idx = voiced_indices[i]
-                    time = pitch.x1 + idx * pitch.dx
-                    if time < sound.duration:
-                        # Extract spectrum at this time
-                        spectrum = sound.to_spectrum_at_time(time)
-                        if spectrum:
-                            # Calculate harmonic and noise components
-                            frequencies = spectrum.xs()
-                            powers = spectrum.ys()
-
-                            # Find fundamental frequency
-                            f0 = pitch_values[idx]
-                            if f0 > 0:
-                                # Find harmonics
-                                harmonic_power = 0
-                                noise_power = 0
-
-                                for j, freq in enumerate(frequencies):
-                                    # Check if frequency is near a harmonic of F0
-                                    harmonic_number = round(freq / f0)
-                                    if harmonic_number > 0 and harmonic_number <= 5:  # First 5 harmonics
-                                        # Within 10% tolerance
-                                        if abs(freq - harmonic_number * f0) < f0 * 0.1:
-                                            harmonic_power += powers[j]
-                                        else:
-                                            noise_power += powers[j]
-                                    else:
-                                        noise_power += powers[j]
-
-                                if noise_power > 0:
-                                    hnr = 10 * \
-                                        np.log10(harmonic_power / noise_power)
-                                    hnr_manual_values.append(hnr)
-
-                if len(hnr_manual_values) > 0:
-                    hnr_values['hnr_manual'] = np.mean(hnr_manual_values)
-                else:
-                    hnr_values['hnr_manual'] = None
+        # Get amplitude values at pitch points
+        pitch_values = pitch.selected_array['frequency']
+        voiced_indices = np.where(pitch_values > 0)[0]
+
+        if len(voiced_indices) > 5:
+            # Peak amplitude of the pitch period around every voiced frame
+            times = pitch.x1 + voiced_indices * pitch.dx
+            in_range = times < sound.duration
+            with stage('period_amplitudes'):
+                amplitude_values = period_peak_amplitudes(
+                    sound.values.mean(axis=0), sound.sampling_frequency,
+                    times[in_range], pitch_values[voiced_indices][in_range],
+                    start_time=sound.x1)
+
+            if len(amplitude_values) > 5:
+                # Calculate shimmer as coefficient of variation of amplitude
+                shimmer_manual = np.std(
+                    amplitude_values) / np.mean(amplitude_values)
+                shimmer_values['shimmer_manual'] = shimmer_manual
             else:
-                hnr_values['hnr_manual'] = None
-        except:
-            hnr_values['hnr_manual'] = None
+                shimmer_values['shimmer_manual'] = None
+        else:
+            shimmer_values['shimmer_manual'] = None
+    except:
+        shimmer_values['shimmer_manual'] = None
+
+    return shimmer_values
 
-        return hnr_values
+
+def extract_shimmer(audio_path, pitch=None, pitch_config=None):
+    """Extract shimmer (amplitude perturbation) from an audio file or a shared AudioAnalysis."""
+    try:
+        # Sound, Pitch and pulse times, built on first use
+        analysis = AudioAnalysis.of(audio_path, pitch, pitch_config)
+
+        return shimmer_from_pitch(analysis.sound, analysis.pitch, analysis.pulses)
 
     except Exception as e:
-        return {key: None for key in ['hnr_autocorr', 'hnr_cepstral', 'hnr_manual']}
+        return {key: None for key in SHIMMER_KEYS}
+
+
+def f0_from_pitch(pitch):
+    """Compute F0 statistics from an already-computed Pitch object."""
+    # Get pitch values
+    pitch_values = pitch.selected_array['frequency']
+    voiced_pitch = pitch_values[pitch_values > 0]
 
+    if len(voiced_pitch) == 0:
+        return {key: None for key in F0_KEYS}
 
-def extract_zero_crossing_rate(audio_path):
-    """Extract Zero-Crossing Rate (ZCR) from audio file."""
+    # Calculate F0 statistics
+    f0_mean = np.mean(voiced_pitch)
+    f0_min = np.min(voiced_pitch)
+    f0_max = np.max(voiced_pitch)
+    f0_range = f0_max - f0_min
+    f0_std = np.std(voiced_pitch)
+
+    return {
+        'f0_mean': f0_mean,
+        'f0_min': f0_min,
+        'f0_max': f0_max,
+        'f0_range': f0_range,
+        'f0_std': f0_std
+    }
+
+
+def extract_fundamental_frequency(audio_path, pitch=None, pitch_config=None):
+    """Extract Fundamental Frequency (F0) statistics from an audio file or a shared AudioAnalysis."""
     try:
-        # Load audio file
-        sound = parselmouth.Sound(audio_path)
-
-        # Get audio samples
-        samples = sound.values
-
-        # Calculate zero-crossing rate
-        zero_crossings = np.sum(np.diff(np.signbit(samples)))
-        zcr = zero_crossings / (2 * len(samples))  # Normalize by signal length
-
-        # Calculate ZCR for different segments
-        segment_length = len(samples) // 10  # Divide into 10 segments
-        zcr_segments = []
-
-        for i in range(10):
-            start_idx = i * segment_length
-            end_idx = min((i + 1) * segment_length, len(samples))
-            segment = samples[start_idx:end_idx]
-
-            if len(segment) > 1:
-                segment_zcr = np.sum(
-                    np.diff(np.signbit(segment))) / (2 * len(segment))
-                zcr_segments.append(segment_zcr)
-
-        return {
-            'zcr_overall': zcr,
-            'zcr_mean': np.mean(zcr_segments) if zcr_segments else None,
-            'zcr_std': np.std(zcr_segments) if zcr_segments else None,
-            'zcr_min': np.min(zcr_segments) if zcr_segments else None,
-            'zcr_max': np.max(zcr_segments) if zcr_segments else None
-        }
+        analysis = AudioAnalysis.of(audio_path, pitch, pitch_config)
 
+        return f0_from_pitch(analysis.pitch)
+
+    except Exception as e:
+        return {key: None for key in F0_KEYS}
+
+
+def spectral_hnr(samples, sampling_frequency, times, f0s, start_time=0.0,
+                 window_length=HNR_WINDOW_LENGTH, n_harmonics=HNR_HARMONICS,
+                 tolerance=HNR_TOLERANCE, block_size=HNR_FRAME_BLOCK):
+    """Per-frame HNR (dB) from the short-time power spectrum around each time.
+
+    A bin counts as harmonic when it lies within tolerance * f0 of one of the
+    first n_harmonics multiples of that frame's f0; every other bin is noise.
+    Masks and FFTs are computed for block_size frames at a time, so memory
+    stays bounded on long recordings. Frames without harmonic or noise
+    power are NaN.
+
+    Not calibrated against Praat: harmonics above n_harmonics and the noise
+    in every bin count as noise, so it reads about 14 dB below Praat's
+    Harmonicity on the same signal. It is no longer an output column.
+    """
+    times = np.asarray(times, dtype=float)
+    f0s = np.asarray(f0s, dtype=float)
+    hnr = np.full(len(times), np.nan)
+    if len(times) == 0:
+        return hnr
+
+    # Hann-windowed frame centred on each time, zero-padded to a power of two
+    half = max(1, int(round(window_length * sampling_frequency / 2)))
+    frame_length = 2 * half + 1
+    n_fft = 1 << (frame_length - 1).bit_length()
+    window = np.hanning(frame_length)
+    frequencies = np.fft.rfftfreq(n_fft, 1 / sampling_frequency)
+
+    padded = np.pad(np.asarray(samples, dtype=float), half)
+    frames_view = np.lib.stride_tricks.sliding_window_view(padded, frame_length)
+    centers = np.rint((times - start_time) * sampling_frequency).astype(int)
+    centers = np.clip(centers, 0, len(frames_view) - 1)
+
+    for start in range(0, len(times), block_size):
+        stop = start + block_size
+        f0 = f0s[start:stop, None]
+        frames = frames_view[centers[start:stop]] * window
+        powers = np.abs(np.fft.rfft(frames, n_fft, axis=1)) ** 2
+
+        # Nearest harmonic number of every bin for every frame
+        harmonic_number = np.rint(frequencies / f0)
+        harmonic_mask = ((harmonic_number > 0) & (harmonic_number <= n_harmonics) &
+                         (np.abs(frequencies - harmonic_number * f0) < f0 * tolerance))
+
+        harmonic_power = np.where(harmonic_mask, powers, 0.0).sum(axis=1)
+        noise_power = powers.sum(axis=1) - harmonic_power
+        valid = (harmonic_power > 0) & (noise_power > 0)
+        block_hnr = np.full(len(f0), np.nan)
+        block_hnr[valid] = 10 * np.log10(harmonic_power[valid] / noise_power[valid])
+        hnr[start:stop] = block_hnr
+
+    return hnr
+
+
+def hnr_track(harmonicity):
+    """(times, hnr_db) of every frame of a Praat Harmonicity; NaN where Praat found no periodicity."""
+    values = np.array(harmonicity.values[0], dtype=float)
+    values[values == HNR_UNVOICED_DB] = np.nan
+    times = harmonicity.x1 + np.arange(harmonicity.nx) * harmonicity.dx
+    return times, values
+
+
+def hnr_track_stats(frame_hnr):
+    """Mean, std, min and max HNR over the periodic frames of a track, and their fraction of all frames.
+
+    The mean is Praat's "Get mean" of the Harmonicity (an average in dB).
+    """
+    frame_hnr = np.asarray(frame_hnr, dtype=float)
+    voiced = frame_hnr[np.isfinite(frame_hnr)]
+    if len(voiced) == 0:
+        return {key: None for key in HNR_KEYS}
+    return {
+        'hnr_mean': np.mean(voiced),
+        'hnr_std': np.std(voiced),
+        'hnr_min': np.min(voiced),
+        'hnr_max': np.max(voiced),
+        'hnr_voiced_fraction': len(voiced) / len(frame_hnr)
+    }
+
+
+def hnr_from_harmonicity(harmonicity):
+    """Compute HNR features from a Harmonicity object: its periodic frames only."""
+    try:
+        _, frame_hnr = hnr_track(harmonicity)
+        return hnr_track_stats(frame_hnr)
     except Exception as e:
-        return {
-            'zcr_overall': None,
-            'zcr_mean': None,
-            'zcr_std': None,
-            'zcr_min': None,
-            'zcr_max': None
-        }
+        return {key: None for key in HNR_KEYS}
 
 
-def extract_voice_breaks(audio_path):
-    """Extract Voice Breaks / Unvoiced Segments information from audio file."""
+def extract_hnr(audio_path, pitch=None, pitch_config=None):
+    """Extract Harmonics-to-Noise Ratio (HNR) from an audio file or a shared AudioAnalysis."""
     try:
-        # Load audio file
-        sound = parselmouth.Sound(audio_path)
+        # Harmonicity, built on first use
+        analysis = AudioAnalysis.of(audio_path, pitch, pitch_config)
 
-        # Extract pitch
-        pitch = sound.to_pitch()
+        return hnr_from_harmonicity(analysis.harmonicity)
 
-        # Get pitch values
-        pitch_values = pitch.selected_array['frequency']
+    except Exception as e:
+        return {key: None for key in HNR_KEYS}
+
+
+def sign_change_counts(samples):
+    """Running count of sign changes per channel; column i counts changes up to sample i."""
+    sign_changes = np.diff(np.signbit(samples), axis=1)
+    counts = np.zeros(samples.shape, dtype=np.int32)
+    np.cumsum(sign_changes, axis=1, dtype=np.int32, out=counts[:, 1:])
+    return counts
+
+
+def zcr_track(samples, sampling_frequency, frame_length_ms=ZCR_FRAME_LENGTH_MS,
+              hop_ms=ZCR_HOP_MS):
+    """Per-frame zero-crossing rate, shape (channels, frames).
+
+    The sign-change vector is computed once; each frame's count is the
+    difference of two running-count entries, so frames are never copied.
+    Rates are crossings per sample. A signal shorter than one frame gives
+    a single frame spanning the whole signal.
+    """
+    samples = np.atleast_2d(samples)
+    if samples.shape[1] < 2:
+        return np.empty((samples.shape[0], 0))
+    return _frame_rates(sign_change_counts(samples), sampling_frequency, frame_length_ms, hop_ms)
+
+
+def _frame_rates(counts, sampling_frequency, frame_length_ms, hop_ms):
+    """Per-frame crossing rates from a running sign-change count (see sign_change_counts)."""
+    n_samples = counts.shape[1]
+    frame_length = max(2, int(round(frame_length_ms * sampling_frequency / 1000)))
+    hop = max(1, int(round(hop_ms * sampling_frequency / 1000)))
+    frame_length = min(frame_length, n_samples)
+    starts = np.arange(0, n_samples - frame_length + 1, hop)
+    frame_counts = counts[:, starts + frame_length - 1] - counts[:, starts]
+    return frame_counts / frame_length
+
+
+def zcr_from_sound(sound, frame_length_ms=ZCR_FRAME_LENGTH_MS, hop_ms=ZCR_HOP_MS):
+    """Compute Zero-Crossing Rate (ZCR) statistics from an already-loaded Sound or WavSamples.
+
+    Channels are analysed separately and averaged, never concatenated.
+    """
+    # Get audio samples, one row per channel
+    samples = np.atleast_2d(sound.values)
+    if samples.shape[1] < 2:
+        return {key: None for key in ZCR_KEYS}
+
+    # Overall rate: sign changes per sample over the whole signal
+    counts = sign_change_counts(samples)
+    zcr = np.mean(counts[:, -1]) / samples.shape[1]
+
+    # Framewise rate from the same running count, averaged across channels
+    zcr_frames = _frame_rates(counts, sound.sampling_frequency,
+                              frame_length_ms, hop_ms).mean(axis=0)
+
+    return {
+        'zcr_overall': zcr,
+        'zcr_mean': np.mean(zcr_frames),
+        'zcr_std': np.std(zcr_frames),
+        'zcr_min': np.min(zcr_frames),
+        'zcr_max': np.max(zcr_frames)
+    }
+
+
+def extract_zero_crossing_rate(audio_path, frame_length_ms=ZCR_FRAME_LENGTH_MS, hop_ms=ZCR_HOP_MS):
+    """Extract Zero-Crossing Rate (ZCR) from an audio file or a shared AudioAnalysis.
+
+    Reads the stored samples directly (int16 stays int16) rather than
+    building a Praat Sound, unless the analysis already holds one.
+    """
+    try:
+        analysis = AudioAnalysis.of(audio_path)
 
-        # Calculate voiced vs unvoiced segments
-        voiced_mask = pitch_values > 0
-        unvoiced_mask = pitch_values == 0
+        return zcr_from_sound(analysis.samples, frame_length_ms, hop_ms)
 
-        total_frames = len(pitch_values)
-        voiced_frames = np.sum(voiced_mask)
-        unvoiced_frames = np.sum(unvoiced_mask)
+    except Exception as e:
+        return {key: None for key in ZCR_KEYS}
+
+
+def run_length_encode(values):
+    """Split a 1-D array into runs of equal values.
+
+    Returns (starts, lengths, run_values) as arrays, using np.diff/np.flatnonzero
+    on the change points rather than a Python loop over frames.
+    """
+    values = np.asarray(values)
+    if len(values) == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int), values[:0]
+    change_points = np.flatnonzero(values[1:] != values[:-1]) + 1
+    starts = np.concatenate(([0], change_points))
+    lengths = np.diff(np.concatenate((starts, [len(values)])))
+    return starts, lengths, values[starts]
+
+
+def voice_breaks_from_pitch(pitch, active_region=None):
+    """Compute voice breaks / unvoiced segment statistics from an already-computed Pitch.
+
+    If active_region (trim.ActiveRegion) asks to keep the trimmed silence in
+    the voicing, its seconds are counted as unvoiced frames in the
+    voiced/unvoiced percentages.
+    """
+    # Get pitch values
+    pitch_values = pitch.selected_array['frequency']
+
+    # Calculate voiced vs unvoiced segments
+    voiced_mask = pitch_values > 0
+    unvoiced_mask = pitch_values == 0
+
+    total_frames = len(pitch_values)
+    if total_frames == 0:
+        return {key: None for key in VOICE_BREAKS_KEYS}
+    voiced_frames = np.sum(voiced_mask)
+    unvoiced_frames = np.sum(unvoiced_mask)
+
+    # Frames the trimmed silence would have given, all unvoiced
+    if active_region is not None and active_region.keep_silence_in_voicing:
+        silent_frames = int(round(active_region.trimmed / pitch.dx))
+        total_frames += silent_frames
+        unvoiced_frames += silent_frames
+
+    # Calculate percentages
+    voiced_percentage = (voiced_frames / total_frames) * 100
+    unvoiced_percentage = (unvoiced_frames / total_frames) * 100
+
+    # Voiced and unvoiced segments as runs of the voicing mask
+    starts, lengths, run_is_voiced = run_length_encode(voiced_mask)
+    voiced_segments = lengths[run_is_voiced]
+    unvoiced_segments = lengths[~run_is_voiced]
+
+    # Voice breaks: unvoiced runs that follow a voiced run
+    break_segments = lengths[~run_is_voiced & (starts > 0)]
+    voice_breaks = len(break_segments)
+    break_durations = break_segments * pitch.dx
+
+    # Calculate statistics
+    avg_voiced_duration = np.mean(
+        voiced_segments) if len(voiced_segments) else 0
+    avg_unvoiced_duration = np.mean(
+        unvoiced_segments) if len(unvoiced_segments) else 0
+
+    return {
+        'voice_breaks_count': voice_breaks,
+        'voiced_percentage': voiced_percentage,
+        'unvoiced_percentage': unvoiced_percentage,
+        'avg_voiced_duration': avg_voiced_duration,
+        'avg_unvoiced_duration': avg_unvoiced_duration,
+        'voiced_segments_count': len(voiced_segments),
+        'unvoiced_segments_count': len(unvoiced_segments),
+        'avg_voiced_duration_sec': avg_voiced_duration * pitch.dx,
+        'avg_unvoiced_duration_sec': avg_unvoiced_duration * pitch.dx,
+        'median_break_duration_sec': np.median(break_durations) if voice_breaks else 0,
+        'p90_break_duration_sec': np.percentile(break_durations, 90) if voice_breaks else 0
+    }
+
+
+def extract_voice_breaks(audio_path, pitch=None, pitch_config=None):
+    """Extract Voice Breaks / Unvoiced Segments information from an audio file or a shared AudioAnalysis."""
+    try:
+        analysis = AudioAnalysis.of(audio_path, pitch, pitch_config)
 
-        # Calculate percentages
-        voiced_percentage = (voiced_frames / total_frames) * 100
-        unvoiced_percentage = (unvoiced_frames / total_frames) * 100
+        return voice_breaks_from_pitch(analysis.pitch, analysis.active_region)
 
-        # Calculate voice breaks (transitions from voiced to unvoiced)
-        voice_breaks = np.sum(np.diff(voiced_mask.astype(int)) == -1)
+    except Exception as e:
+        return {key: None for key in VOICE_BREAKS_KEYS}
 
-        # Calculate average duration of voiced and unvoiced segments
-        voiced_segments = []
-        unvoiced_segments = []
 
-        current_segment_length = 1
-        current_is_voiced = voiced_mask[0]
+def extract_all_features(audio_path, pitch=None, pitch_config=None):
+    """Extract all six feature families from one shared AudioAnalysis, decoding and pitch-tracking at most once."""
+    analysis = AudioAnalysis.of(audio_path, pitch, pitch_config)
 
-        for i in range(1, len(voiced_mask)):
-            if voiced_mask[i] == current_is_voiced:
-                current_segment_length += 1
-            else:
-                if current_is_voiced:
-                    voiced_segments.append(current_segment_length)
-                else:
-                    unvoiced_segments.append(current_segment_length)
-                current_segment_length = 1
-                current_is_voiced = voiced_mask[i]
-
-        # Add the last segment
-        if current_is_voiced:
-            voiced_segments.append(current_segment_length)
-        else:
-            unvoiced_segments.append(current_segment_length)
-
-        # Calculate statistics
-        avg_voiced_duration = np.mean(
-            voiced_segments) if voiced_segments else 0
-        avg_unvoiced_duration = np.mean(
-            unvoiced_segments) if unvoiced_segments else 0
-
-        return {
-            'voice_breaks_count': voice_breaks,
-            'voiced_percentage': voiced_percentage,
-            'unvoiced_percentage': unvoiced_percentage,
-            'avg_voiced_duration': avg_voiced_duration,
-            'avg_unvoiced_duration': avg_unvoiced_duration,
-            'voiced_segments_count': len(voiced_segments),
-            'unvoiced_segments_count': len(unvoiced_segments)
-        }
+    features = {}
+    for extract in (extract_jitter, extract_shimmer, extract_fundamental_frequency,
+                    extract_hnr, extract_zero_crossing_rate, extract_voice_breaks):
+        features.update(extract(analysis))
 
-    except Exception as e:
-        return {
-            'voice_breaks_count': None,
-            'voiced_percentage': None,
-            'unvoiced_percentage': None,
-            'avg_voiced_duration': None,
-            'avg_unvoiced_duration': None,
-            'voiced_segments_count': None,
-            'unvoiced_segments_count': None
-        }
+    return {key: features[key] for key in ALL_FEATURE_KEYS}
@@ -0,0 +1,140 @@
+import sys
+import time
+import argparse
+import parselmouth
+from parselmouth.praat import call
+from audio_analysis import to_point_process
+from perturbation import (PERIOD_FLOOR, PERIOD_CEILING, MAX_PERIOD_FACTOR, MAX_AMPLITUDE_FACTOR,
+                          JITTER_MEASURES, SHIMMER_MEASURES, pulse_times, jitter_from_pulses,
+                          pulse_amplitudes, shimmer_from_pulses)
+from synthetic_voice import VoiceSpec, voice_fixture
+from benchmark import FIXTURE_DIR
+from registry import resolve_families
+from extract_features import build_run_parser, build_extractor
+from pitch_store import PitchTrack
+from utils import extract_jitter, extract_shimmer
+
+TOLERANCE = 1e-6  # largest relative difference from Praat that passes
+PRAAT_JITTER = {'local': 'local', 'rap': 'rap', 'ppq5': 'ppq5', 'ddp': 'ddp'}
+PRAAT_SHIMMER = {'local': 'local', 'local_db': 'local_dB', 'apq3': 'apq3',
+                 'apq5': 'apq5', 'apq11': 'apq11'}
+PULSE_KEYS = (['jitter_' + measure for measure in JITTER_MEASURES] +
+              ['shimmer_' + measure for measure in SHIMMER_MEASURES])
+
+# Clean to very rough voices, with and without pauses
+VALIDATION_SPECS = [
+    VoiceSpec(5, seed=0),
+    VoiceSpec(5, f0=110, jitter=0.02, shimmer=0.1, hnr_db=10, seed=1),
+    VoiceSpec(5, f0=220, jitter=0.005, shimmer=0.02, hnr_db=30, pauses=False, seed=2),
+    VoiceSpec(10, f0=130, jitter=0.03, shimmer=0.15, hnr_db=5, seed=3),
+]
+
+
+def praat_perturbation(sound, point_process):
+    """{'jitter_<measure>', 'shimmer_<measure>'} from Praat's own queries, with the same settings."""
+    values = {}
+    for measure in JITTER_MEASURES:
+        values['jitter_' + measure] = call(point_process, f"Get jitter ({PRAAT_JITTER[measure]})", 0, 0,
+                                           PERIOD_FLOOR, PERIOD_CEILING, MAX_PERIOD_FACTOR)
+    for measure in SHIMMER_MEASURES:
+        values['shimmer_' + measure] = call([sound, point_process],
+                                            f"Get shimmer ({PRAAT_SHIMMER[measure]})", 0, 0,
+                                            PERIOD_FLOOR, PERIOD_CEILING, MAX_PERIOD_FACTOR,
+                                            MAX_AMPLITUDE_FACTOR)
+    return values
+
+
+def numpy_perturbation(sound, point_process):
+    """The same measures from perturbation.py."""
+    times = pulse_times(point_process)
+    jitter = jitter_from_pulses(times)
+    amplitude_times, amplitudes = pulse_amplitudes(sound.values.mean(axis=0), sound.sampling_frequency,
+                                                   times, start_time=sound.x1)
+    shimmer = shimmer_from_pulses(amplitude_times, amplitudes)
+    return {**{'jitter_' + measure: value for measure, value in jitter.items()},
+            **{'shimmer_' + measure: value for measure, value in shimmer.items()}}
+
+
+def relative_difference(value, reference):
+    """|value - reference| / |reference|; inf when only one of them is undefined."""
+    if value is None or reference != reference:  # Praat returns NaN for undefined
+        return 0.0 if value is None and reference != reference else float('inf')
+    if reference == 0:
+        return abs(value)
+    return abs(value - reference) / abs(reference)
+
+
+def _from_stored_track(audio_path):
+    """Jitter and shimmer given a stored PitchTrack, as the pitch store would hand them over."""
+    track = PitchTrack.from_pitch(parselmouth.Sound(audio_path).to_pitch_ac())
+    return {**extract_jitter(audio_path, pitch=track), **extract_shimmer(audio_path, pitch=track)}
+
+
+def pipeline_coverage(audio_paths):
+    """{run: [pulse columns left empty on some file]} for the extraction runs users start.
+
+    Guards against the pulse-based columns silently going empty, as they
+    did when a stored pitch contour was used by default.
+    """
+    runs = {}
+    for label, argv in (('default options', []), ('--pitch-store', ['--pitch-store'])):
+        args = build_run_parser()[0].parse_args(argv)
+        runs[label] = build_extractor(args, resolve_families(args.features))[0]
+    runs['stored PitchTrack'] = _from_stored_track
+    missing = {}
+    for label, extract in runs.items():
+        results = [extract(audio_path) for audio_path in audio_paths]
+        missing[label] = [key for key in PULSE_KEYS if any(result[key] is None for result in results)]
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the NumPy jitter and shimmer measures against Praat on synthetic voices.")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help=f"Largest relative difference that passes (default: {TOLERANCE:g})")
+    parser.add_argument('--fixture-dir', default=FIXTURE_DIR,
+                        help=f"Where the synthetic recordings are generated (default: {FIXTURE_DIR})")
+    args = parser.parse_args()
+
+    worst = {}
+    praat_seconds = numpy_seconds = 0.0
+    for spec in VALIDATION_SPECS:
+        sound = parselmouth.Sound(voice_fixture(spec, args.fixture_dir))
+        point_process = to_point_process(sound.to_pitch_ac(), sound)
+        start = time.perf_counter()
+        reference = praat_perturbation(sound, point_process)
+        praat_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        values = numpy_perturbation(sound, point_process)
+        numpy_seconds += time.perf_counter() - start
+        for key, expected in reference.items():
+            worst[key] = max(worst.get(key, 0.0), relative_difference(values[key], expected))
+
+    print(f"{'Measure':<18}{'Max rel. diff':>14}")
+    for key, difference in worst.items():
+        flag = '' if difference <= args.tolerance else '  ❌'
+        print(f"{key:<18}{difference:>14.1e}{flag}")
+    print(f"\nPraat queries: {praat_seconds * 1000:.1f} ms, NumPy: {numpy_seconds * 1000:.1f} ms "
+          f"over {len(VALIDATION_SPECS)} recordings")
+    failed = [key for key, difference in worst.items() if difference > args.tolerance]
+
+    print(f"\n{'Extraction run':<20}Pulse columns filled")
+    fixture_paths = [voice_fixture(spec, args.fixture_dir) for spec in VALIDATION_SPECS]
+    empty_runs = []
+    for label, missing in pipeline_coverage(fixture_paths).items():
+        print(f"{label:<20}{'all' if not missing else 'missing ' + ', '.join(missing) + '  ❌'}")
+        if missing:
+            empty_runs.append(label)
+
+    if failed:
+        print(f"\n{len(failed)} measure(s) outside {args.tolerance:g}: {', '.join(failed)}")
+    if empty_runs:
+        print(f"\nPulse-based columns left empty by: {', '.join(empty_runs)}")
+    if failed or empty_runs:
+        sys.exit(1)
+    print(f"\nAll measures within {args.tolerance:g} of Praat and filled in every run")
+
+
+if __name__ == "__main__":
+    main()
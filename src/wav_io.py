@@ -0,0 +1,146 @@
+import os
+import struct
+import numpy as np
+import soundfile as sf
+
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format tag, bits per sample) -> little-endian dtype that can be memory-mapped as is
+_MMAP_DTYPES = {
+    (_WAVE_FORMAT_PCM, 16): np.dtype('<i2'),
+    (_WAVE_FORMAT_PCM, 32): np.dtype('<i4'),
+    (_WAVE_FORMAT_IEEE_FLOAT, 32): np.dtype('<f4'),
+    (_WAVE_FORMAT_IEEE_FLOAT, 64): np.dtype('<f8'),
+}
+
+# Stored sample type for files soundfile decodes, by libsndfile subtype
+_NATIVE_DTYPES = {'PCM_U8': 'int16', 'PCM_S8': 'int16', 'PCM_16': 'int16',
+                  'PCM_24': 'int32', 'PCM_32': 'int32',
+                  'FLOAT': 'float32', 'DOUBLE': 'float64'}
+
+
+class WavInfo:
+    """Format and data-chunk location of a RIFF/WAVE file."""
+
+    def __init__(self, format_tag, channels, sampling_frequency, bits_per_sample,
+                 data_offset, n_frames):
+        self.format_tag = format_tag
+        self.channels = channels
+        self.sampling_frequency = sampling_frequency
+        self.bits_per_sample = bits_per_sample
+        self.data_offset = data_offset
+        self.n_frames = n_frames
+
+    @property
+    def duration(self):
+        return self.n_frames / self.sampling_frequency
+
+    @property
+    def mmap_dtype(self):
+        """dtype to memory-map the samples with, or None if they need decoding."""
+        return _MMAP_DTYPES.get((self.format_tag, self.bits_per_sample))
+
+
+def read_wav_header(audio_path):
+    """Parse the fmt and data chunks of a WAV file; ValueError if it is not a plain RIFF/WAVE."""
+    file_size = os.path.getsize(audio_path)
+    with open(audio_path, 'rb') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError(f"Not a RIFF/WAVE file: {audio_path}")
+        fmt = None
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                raise ValueError(f"No data chunk in {audio_path}")
+            chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+            if chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                if chunk_size % 2:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                break
+            else:
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+        data_offset = f.tell()
+
+    if fmt is None or len(fmt) < 16:
+        raise ValueError(f"No fmt chunk before the data chunk in {audio_path}")
+    format_tag, channels, sampling_frequency, _, block_align, bits_per_sample = \
+        struct.unpack('<HHIIHH', fmt[:16])
+    if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        # The first two bytes of the sub-format GUID are the real format tag
+        format_tag = struct.unpack('<H', fmt[24:26])[0]
+    if channels == 0 or block_align == 0:
+        raise ValueError(f"Invalid fmt chunk in {audio_path}")
+
+    # Streaming writers leave the size at 0 or 0xFFFFFFFF; trust the file length instead
+    data_size = min(chunk_size, file_size - data_offset) if chunk_size else file_size - data_offset
+    return WavInfo(format_tag, channels, sampling_frequency, bits_per_sample,
+                   data_offset, data_size // block_align)
+
+
+class WavSamples:
+    """Decoded samples shaped (channels, n) like parselmouth.Sound.values.
+
+    Has the values and sampling_frequency attributes that zcr_from_sound
+    and other sample-level helpers read, so it can stand in for a Sound.
+    """
+
+    def __init__(self, values, sampling_frequency):
+        self.values = values
+        self.sampling_frequency = float(sampling_frequency)
+
+    @property
+    def n_samples(self):
+        return self.values.shape[1]
+
+    @property
+    def duration(self):
+        return self.n_samples / self.sampling_frequency
+
+
+def _to_float(values, dtype):
+    """Integer PCM scaled to [-1, 1) (as Praat reads it) or float samples cast to dtype."""
+    if np.issubdtype(values.dtype, np.integer):
+        full_scale = float(2 ** (8 * values.dtype.itemsize - 1))
+        return (values / full_scale).astype(dtype, copy=False)
+    return values.astype(dtype, copy=False)
+
+
+def load_wav(audio_path, dtype=None):
+    """Read an audio file into a read-only WavSamples without going through parselmouth.
+
+    16/32-bit PCM and float WAV files are memory-mapped, so with dtype=None
+    (keep the stored type) the samples are a zero-copy view: int16 stays
+    int16, a quarter of the float64 a Sound holds. dtype='float64' or
+    'float32' scales integer PCM to [-1, 1). Other formats (24-bit, 8-bit,
+    FLAC, ...) are decoded by soundfile.
+    """
+    try:
+        info = read_wav_header(audio_path)
+    except (ValueError, struct.error):
+        info = None
+
+    # Memory-map when the stored type is kept or only needs scaling to float
+    if (info is not None and info.mmap_dtype is not None
+            and (dtype is None or np.dtype(dtype).kind == 'f')):
+        if info.n_frames == 0:
+            values = np.empty((info.channels, 0), dtype=info.mmap_dtype)
+        else:
+            frames = np.memmap(audio_path, dtype=info.mmap_dtype, mode='r',
+                               offset=info.data_offset, shape=(info.n_frames, info.channels))
+            values = frames.T
+        sampling_frequency = info.sampling_frequency
+        if dtype is not None and values.dtype != np.dtype(dtype):
+            values = _to_float(values, dtype)
+    else:
+        read_dtype = dtype or _NATIVE_DTYPES.get(sf.info(audio_path).subtype, 'float64')
+        frames, sampling_frequency = sf.read(audio_path, dtype=read_dtype, always_2d=True)
+        values = frames.T
+
+    values.flags.writeable = False
+    return WavSamples(values, sampling_frequency)